@@ -0,0 +1,80 @@
+# analysts/analyzer_snapshot.py
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+from analysts.score_analyzer import ScoreProbabilityAnalyzer
+
+# Incrementar quando o conteúdo de export_state mudar
+SNAPSHOT_FORMAT_VERSION = 1
+
+def file_checksum(path: str) -> str:
+    """SHA-256 do arquivo de dados de origem; identifica a versão do dataset"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def save_snapshot(analyzer: ScoreProbabilityAnalyzer, path: str, source_checksum: str):
+    """Grava o estado do analisador (forças, partidas codificadas e confrontos pré-calculados)"""
+    analyzer.precompute_fixtures()
+    state = analyzer.export_state()
+    metadata = {
+        'format_version': SNAPSHOT_FORMAT_VERSION,
+        'source_checksum': source_checksum,
+        'created_at': datetime.now().isoformat(),
+        'n_matches_2023': state.pop('n_matches_2023'),
+        'team_stats': state.pop('team_stats')
+    }
+
+    # Arquivo temporário exclusivo no mesmo diretório: gravações simultâneas não se misturam
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.npz.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, metadata=np.array(json.dumps(metadata, ensure_ascii=False)), **state)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def load_snapshot(path: str, source_checksum: Optional[str] = None) -> Optional[ScoreProbabilityAnalyzer]:
+    """Carrega o analisador do snapshot; retorna None se ausente, corrompido ou desatualizado
+
+    Com source_checksum, o snapshot só é aceito se foi gerado a partir do mesmo
+    arquivo de dados.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            metadata = json.loads(str(data['metadata']))
+            if metadata.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+                return None
+            if source_checksum is not None and metadata.get('source_checksum') != source_checksum:
+                return None
+            state = {name: data[name] for name in data.files if name != 'metadata'}
+        state['n_matches_2023'] = metadata['n_matches_2023']
+        state['team_stats'] = metadata['team_stats']
+        # Snapshot com a versão certa mas incompleto também é descartado
+        return ScoreProbabilityAnalyzer.from_state(state)
+    except (OSError, KeyError, ValueError, TypeError, IndexError, AttributeError, zipfile.BadZipFile):
+        return None
+
+def load_or_build_analyzer(data_file: str, snapshot_path: str) -> ScoreProbabilityAnalyzer:
+    """Usa o snapshot se estiver em dia com data_file; caso contrário reconstrói e regrava"""
+    checksum = file_checksum(data_file)
+    analyzer = load_snapshot(snapshot_path, checksum)
+    if analyzer is not None:
+        return analyzer
+
+    with open(data_file, 'r', encoding='utf-8') as f:
+        analyzer = ScoreProbabilityAnalyzer(json.load(f))
+    save_snapshot(analyzer, snapshot_path, checksum)
+    return analyzer
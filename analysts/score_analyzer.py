@@ -1,11 +1,89 @@
 # analysts/score_analyzer.py
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from scipy.stats import poisson
 import math
 
+# Minutos regulamentares usados para escalonar a expectativa de gols no modo ao vivo
+MATCH_MINUTES = 90
+# Gols adicionais considerados por time no modo ao vivo (cauda acima disso é desprezível)
+INPLAY_MAX_EXTRA_GOALS = 10
+# Placares finais mais prováveis guardados por minuto no modo ao vivo
+INPLAY_TOP_SCORES = 20
+
+_GOALS_RANGE = np.arange(INPLAY_MAX_EXTRA_GOALS + 1, dtype=float)
+_LOG_FACTORIALS = np.array([math.lgamma(k + 1) for k in range(INPLAY_MAX_EXTRA_GOALS + 1)])
+_EXTRA_HOME, _EXTRA_AWAY = np.meshgrid(
+    np.arange(INPLAY_MAX_EXTRA_GOALS + 1), np.arange(INPLAY_MAX_EXTRA_GOALS + 1), indexing='ij'
+)
+_EXTRA_DIFF_INDEX = (_EXTRA_HOME - _EXTRA_AWAY + INPLAY_MAX_EXTRA_GOALS).ravel()
+_EXTRA_TOTAL = (_EXTRA_HOME + _EXTRA_AWAY).ravel()
+
+def _tail(cumulative: List[float], index: int) -> float:
+    """Consulta uma cauda acumulada P(X >= index) com limites"""
+    if index <= 0:
+        return cumulative[0]
+    if index >= len(cumulative):
+        return 0.0
+    return cumulative[index]
+
+# Placares analisados no pré-jogo (0-0 até 5-5)
+MAX_SCORE_GOALS = 5
+_SCORE_GOALS = np.arange(MAX_SCORE_GOALS + 1, dtype=float)
+_SCORE_LOG_FACTORIALS = _LOG_FACTORIALS[:MAX_SCORE_GOALS + 1]
+
+def _bootstrap_score_batch(home_idx: np.ndarray, away_idx: np.ndarray, home_goals: np.ndarray,
+                           away_goals: np.ndarray, n_teams: int, home_team: int, away_team: int,
+                           size: int, seed) -> np.ndarray:
+    """Calcula a matriz de placares 6x6 de um lote de reamostragens do histórico
+    
+    As forças de todos os times são recalculadas em cada reamostragem com bincount
+    sobre índices deslocados por reamostragem, sem laços em Python. Retorna um
+    array (size, 36) com as probabilidades normalizadas de cada placar.
+    """
+    rng = np.random.default_rng(seed)
+    n_matches = len(home_idx)
+    sample = rng.integers(0, n_matches, size=(size, n_matches))
+    
+    offsets = (np.arange(size) * n_teams)[:, None]
+    home_slots = (home_idx[sample] + offsets).ravel()
+    away_slots = (away_idx[sample] + offsets).ravel()
+    sampled_home_goals = home_goals[sample]
+    sampled_away_goals = away_goals[sample]
+    
+    def aggregate(slots, weights=None):
+        return np.bincount(slots, weights=weights, minlength=size * n_teams).reshape(size, n_teams)
+    
+    home_games = aggregate(home_slots)
+    away_games = aggregate(away_slots)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_for_home = np.where(home_games > 0, aggregate(home_slots, sampled_home_goals.ravel()) / home_games, 0.0)
+        avg_against_home = np.where(home_games > 0, aggregate(home_slots, sampled_away_goals.ravel()) / home_games, 0.0)
+        avg_for_away = np.where(away_games > 0, aggregate(away_slots, sampled_away_goals.ravel()) / away_games, 0.0)
+        avg_against_away = np.where(away_games > 0, aggregate(away_slots, sampled_home_goals.ravel()) / away_games, 0.0)
+    
+    league_avg_home = sampled_home_goals.mean(axis=1)
+    league_avg_away = sampled_away_goals.mean(axis=1)
+    safe_home = np.where(league_avg_home > 0, league_avg_home, 1.0)[:, None]
+    safe_away = np.where(league_avg_away > 0, league_avg_away, 1.0)[:, None]
+    
+    # Mesmas fórmulas de _calculate_team_stats, para todos os times de uma vez
+    attack_home = np.where(league_avg_home[:, None] > 0, avg_for_home / safe_home, 1.0)
+    attack_away = np.where(league_avg_away[:, None] > 0, avg_for_away / safe_away, 1.0)
+    defense_home = np.where(league_avg_away[:, None] > 0, avg_against_home / safe_away, 1.0)
+    defense_away = np.where(league_avg_home[:, None] > 0, avg_against_away / safe_home, 1.0)
+    
+    expected_home = np.clip(attack_home[:, home_team] * defense_away[:, away_team] * league_avg_home, 0.1, 4.0)
+    expected_away = np.clip(attack_away[:, away_team] * defense_home[:, home_team] * league_avg_away, 0.1, 4.0)
+    
+    home_pmf = np.exp(_SCORE_GOALS * np.log(expected_home)[:, None] - expected_home[:, None] - _SCORE_LOG_FACTORIALS)
+    away_pmf = np.exp(_SCORE_GOALS * np.log(expected_away)[:, None] - expected_away[:, None] - _SCORE_LOG_FACTORIALS)
+    joint = (home_pmf[:, :, None] * away_pmf[:, None, :]).reshape(size, -1)
+    return joint / joint.sum(axis=1, keepdims=True)
+
 class ScoreProbabilityAnalyzer:
     def __init__(self, matches_data: Dict):
         self.matches_2023 = matches_data.get('2023', [])
@@ -15,6 +93,22 @@ class ScoreProbabilityAnalyzer:
         
         # Estatísticas por time
         self.team_stats = self._calculate_team_stats()
+        self._expected_goals_cache: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        self._score_grids: Dict[Tuple[str, str], np.ndarray] = {}
+        self._inplay_slices: Dict[Tuple[str, str, int], Dict] = {}
+        self._encode_matches()
+    
+    def _encode_matches(self):
+        """Codifica as partidas em arrays inteiros (índice do time e gols) para cálculos vetorizados"""
+        team_codes, self.team_names = pd.factorize(
+            pd.concat([self.df_all['home_team'], self.df_all['away_team']], ignore_index=True)
+        )
+        n_matches = len(self.df_all)
+        self.team_index = {team: i for i, team in enumerate(self.team_names)}
+        self.home_idx = team_codes[:n_matches].astype(np.int64)
+        self.away_idx = team_codes[n_matches:].astype(np.int64)
+        self.home_goals = self.df_all['home_score'].to_numpy(dtype=float)
+        self.away_goals = self.df_all['away_score'].to_numpy(dtype=float)
     
     def _calculate_team_stats(self) -> Dict:
         """Calcula estatísticas ofensivas e defensivas de cada time"""
@@ -67,10 +161,12 @@ class ScoreProbabilityAnalyzer:
         
         return team_stats
     
-    def calculate_score_probabilities(self, home_team: str, away_team: str) -> Dict:
-        """Calcula probabilidades para todos os placares possíveis"""
-        if home_team not in self.team_stats or away_team not in self.team_stats:
-            return {}
+    def _expected_goals(self, home_team: str, away_team: str) -> Tuple[float, float]:
+        """Expectativa de gols (modelo de Poisson) de mandante e visitante, com cache por confronto"""
+        key = (home_team, away_team)
+        cached = self._expected_goals_cache.get(key)
+        if cached is not None:
+            return cached
         
         # Calcula expectativa de gols usando o modelo de Poisson
         home_attack = self.team_stats[home_team]['attack_home']
@@ -89,6 +185,96 @@ class ScoreProbabilityAnalyzer:
         expected_home_goals = max(0.1, min(4.0, expected_home_goals))
         expected_away_goals = max(0.1, min(4.0, expected_away_goals))
         
+        self._expected_goals_cache[key] = (expected_home_goals, expected_away_goals)
+        return expected_home_goals, expected_away_goals
+    
+    def _score_grid(self, home_team: str, away_team: str) -> np.ndarray:
+        """Probabilidades conjuntas de Poisson (não normalizadas) de 0-0 até 5-5, com cache"""
+        key = (home_team, away_team)
+        grid = self._score_grids.get(key)
+        if grid is None:
+            expected_home_goals, expected_away_goals = self._expected_goals(home_team, away_team)
+            grid = np.outer(
+                poisson.pmf(_SCORE_GOALS, expected_home_goals), poisson.pmf(_SCORE_GOALS, expected_away_goals)
+            )
+            self._score_grids[key] = grid
+        return grid
+    
+    def precompute_fixtures(self):
+        """Pré-calcula expectativa de gols e grade de placares de todos os confrontos possíveis"""
+        for home_team in self.team_stats:
+            for away_team in self.team_stats:
+                if home_team != away_team:
+                    self._score_grid(home_team, away_team)
+    
+    def export_state(self) -> Dict:
+        """Estado já calculado do analisador, usado pelo snapshot de inicialização rápida"""
+        fixtures = list(self._score_grids)
+        return {
+            'n_matches_2023': len(self.matches_2023),
+            'team_stats': {
+                team: {key: value.item() if hasattr(value, 'item') else value for key, value in stats.items()}
+                for team, stats in self.team_stats.items()
+            },
+            'team_names': np.asarray(self.team_names, dtype=str),
+            'home_idx': self.home_idx,
+            'away_idx': self.away_idx,
+            'home_goals': self.home_goals,
+            'away_goals': self.away_goals,
+            'total_goals': (
+                self.df_all['total_goals'].to_numpy(dtype=float) if 'total_goals' in self.df_all
+                else self.home_goals + self.away_goals
+            ),
+            'fixture_home_idx': np.array([self.team_index[home] for home, _ in fixtures], dtype=np.int64),
+            'fixture_away_idx': np.array([self.team_index[away] for _, away in fixtures], dtype=np.int64),
+            'fixture_expected_goals': np.array([self._expected_goals(*fixture) for fixture in fixtures]).reshape(-1, 2),
+            'fixture_score_grids': np.array([self._score_grids[fixture] for fixture in fixtures]).reshape(-1, 6, 6)
+        }
+    
+    @classmethod
+    def from_state(cls, state: Dict) -> 'ScoreProbabilityAnalyzer':
+        """Reconstrói o analisador a partir de export_state sem recalcular estatísticas"""
+        analyzer = cls.__new__(cls)
+        team_names = pd.Index([str(name) for name in state['team_names']])
+        
+        analyzer.team_names = team_names
+        analyzer.team_index = {team: i for i, team in enumerate(team_names)}
+        analyzer.home_idx = state['home_idx']
+        analyzer.away_idx = state['away_idx']
+        analyzer.home_goals = state['home_goals']
+        analyzer.away_goals = state['away_goals']
+        analyzer.df_all = pd.DataFrame({
+            'home_team': team_names.take(analyzer.home_idx),
+            'away_team': team_names.take(analyzer.away_idx),
+            'home_score': analyzer.home_goals.astype(np.int64),
+            'away_score': analyzer.away_goals.astype(np.int64),
+            'total_goals': state['total_goals'].astype(np.int64)
+        })
+        analyzer.all_matches = analyzer.df_all.to_dict('records')
+        analyzer.matches_2023 = analyzer.all_matches[:state['n_matches_2023']]
+        analyzer.matches_2024 = analyzer.all_matches[state['n_matches_2023']:]
+        analyzer.team_stats = state['team_stats']
+        
+        fixtures = [
+            (team_names[home], team_names[away])
+            for home, away in zip(state['fixture_home_idx'], state['fixture_away_idx'])
+        ]
+        analyzer._expected_goals_cache = {
+            fixture: (float(expected[0]), float(expected[1]))
+            for fixture, expected in zip(fixtures, state['fixture_expected_goals'])
+        }
+        analyzer._score_grids = dict(zip(fixtures, state['fixture_score_grids']))
+        analyzer._inplay_slices = {}
+        return analyzer
+    
+    def calculate_score_probabilities(self, home_team: str, away_team: str) -> Dict:
+        """Calcula probabilidades para todos os placares possíveis"""
+        if home_team not in self.team_stats or away_team not in self.team_stats:
+            return {}
+        
+        expected_home_goals, expected_away_goals = self._expected_goals(home_team, away_team)
+        score_grid = self._score_grid(home_team, away_team)
+        
         # Calcula probabilidades usando distribuição de Poisson
         score_probabilities = {}
         total_probability = 0
@@ -97,9 +283,7 @@ class ScoreProbabilityAnalyzer:
         for home_goals in range(0, 6):
             for away_goals in range(0, 6):
                 # Probabilidade usando Poisson
-                prob_home = poisson.pmf(home_goals, expected_home_goals)
-                prob_away = poisson.pmf(away_goals, expected_away_goals)
-                joint_probability = prob_home * prob_away
+                joint_probability = score_grid[home_goals, away_goals]
                 
                 score = f"{home_goals}-{away_goals}"
                 score_probabilities[score] = {
@@ -128,8 +312,194 @@ class ScoreProbabilityAnalyzer:
             reverse=True
         ))
     
-    def find_value_bets(self, home_team: str, away_team: str, available_odds: Dict) -> List[Dict]:
-        """Identifica value bets comparando probabilidades com odds disponíveis"""
+    def score_probability_tensor(self, fixtures: List[Tuple[str, str]]) -> np.ndarray:
+        """Probabilidades normalizadas de placar (0-0 até 5-5) para vários confrontos de uma vez
+        
+        Retorna um array (n_confrontos, 6, 6) indexado por [confronto, gols_mandante,
+        gols_visitante]; confrontos com times sem estatísticas ficam com NaN.
+        """
+        expected = np.full((len(fixtures), 2), np.nan)
+        for i, (home_team, away_team) in enumerate(fixtures):
+            if home_team in self.team_stats and away_team in self.team_stats:
+                expected[i] = self._expected_goals(home_team, away_team)
+        
+        log_expected = np.log(expected)
+        home_pmf = np.exp(_SCORE_GOALS * log_expected[:, :1] - expected[:, :1] - _SCORE_LOG_FACTORIALS)
+        away_pmf = np.exp(_SCORE_GOALS * log_expected[:, 1:] - expected[:, 1:] - _SCORE_LOG_FACTORIALS)
+        joint = home_pmf[:, :, None] * away_pmf[:, None, :]
+        return joint / joint.sum(axis=(1, 2), keepdims=True)
+    
+    def _remaining_goals_pmf(self, expected_goals: float, minute: int) -> np.ndarray:
+        """Distribuição de Poisson dos gols restantes, proporcional ao tempo que falta"""
+        rate = expected_goals * (MATCH_MINUTES - minute) / MATCH_MINUTES
+        if rate <= 0:
+            pmf = np.zeros(INPLAY_MAX_EXTRA_GOALS + 1)
+            pmf[0] = 1.0
+            return pmf
+        pmf = np.exp(_GOALS_RANGE * math.log(rate) - rate - _LOG_FACTORIALS)
+        return pmf / pmf.sum()
+    
+    def _inplay_slice(self, home_team: str, away_team: str, minute: int) -> Dict:
+        """Pré-calcula, para um confronto e minuto, as distribuições de gols restantes
+        
+        Guarda a matriz de gols adicionais já ordenada e as caudas acumuladas da
+        diferença e do total de gols, de forma que qualquer placar atual seja
+        respondido apenas com consultas a listas.
+        """
+        key = (home_team, away_team, minute)
+        cached = self._inplay_slices.get(key)
+        if cached is not None:
+            return cached
+        
+        expected_home_goals, expected_away_goals = self._expected_goals(home_team, away_team)
+        home_pmf = self._remaining_goals_pmf(expected_home_goals, minute)
+        away_pmf = self._remaining_goals_pmf(expected_away_goals, minute)
+        
+        # Matriz de gols adicionais (linhas: mandante, colunas: visitante)
+        extra = np.outer(home_pmf, away_pmf).ravel()
+        order = np.argsort(extra)[::-1][:INPLAY_TOP_SCORES]
+        
+        n_bins = 2 * INPLAY_MAX_EXTRA_GOALS + 1
+        diff_pmf = np.bincount(_EXTRA_DIFF_INDEX, weights=extra, minlength=n_bins)
+        total_pmf = np.bincount(_EXTRA_TOTAL, weights=extra, minlength=n_bins)
+        
+        inplay_slice = {
+            'top_home': _EXTRA_HOME.ravel()[order].tolist(),
+            'top_away': _EXTRA_AWAY.ravel()[order].tolist(),
+            'top_probs': extra[order].tolist(),
+            # diff_ge[k] = P(gols_mandante - gols_visitante >= k - MAX); total_ge[t] = P(total >= t)
+            'diff_ge': np.append(np.cumsum(diff_pmf[::-1])[::-1], 0.0).tolist(),
+            'total_ge': np.append(np.cumsum(total_pmf[::-1])[::-1], 0.0).tolist(),
+            'home_no_goal': float(home_pmf[0]),
+            'away_no_goal': float(away_pmf[0]),
+            'expected_home_goals_remaining': round(float(home_pmf @ _GOALS_RANGE), 3),
+            'expected_away_goals_remaining': round(float(away_pmf @ _GOALS_RANGE), 3)
+        }
+        self._inplay_slices[key] = inplay_slice
+        return inplay_slice
+    
+    def calculate_inplay_probabilities(self, home_team: str, away_team: str, minute: float,
+                                       home_score: int, away_score: int, top_n: int = 10) -> Dict:
+        """Recalcula probabilidades de placar final e mercados a partir do minuto e placar atuais
+        
+        Os gols restantes de cada time seguem Poisson com a expectativa pré-jogo
+        escalonada pelo tempo que falta. As distribuições são pré-calculadas por
+        minuto (ver _inplay_slice), então cada atualização custa microssegundos.
+        """
+        if home_team not in self.team_stats or away_team not in self.team_stats:
+            return {}
+        
+        minute = min(max(int(minute), 0), MATCH_MINUTES)
+        inplay_slice = self._inplay_slice(home_team, away_team, minute)
+        
+        final_scores = {}
+        for extra_home, extra_away, probability in zip(
+            inplay_slice['top_home'][:top_n], inplay_slice['top_away'][:top_n], inplay_slice['top_probs'][:top_n]
+        ):
+            if probability <= 0:
+                break
+            final_scores[f"{home_score + extra_home}-{away_score + extra_away}"] = {
+                'probability': round(probability * 100, 3),
+                'fair_odds': round(1 / probability, 2)
+            }
+        
+        diff_ge = inplay_slice['diff_ge']
+        total_ge = inplay_slice['total_ge']
+        
+        # Mandante vence se a diferença de gols adicionais superar away_score - home_score
+        needed_diff = away_score - home_score + INPLAY_MAX_EXTRA_GOALS
+        home_win = _tail(diff_ge, needed_diff + 1)
+        draw = _tail(diff_ge, needed_diff) - home_win
+        over_2_5 = _tail(total_ge, 3 - home_score - away_score)
+        btts = (
+            (1.0 if home_score > 0 else 1.0 - inplay_slice['home_no_goal']) *
+            (1.0 if away_score > 0 else 1.0 - inplay_slice['away_no_goal'])
+        )
+        
+        markets = {
+            'home_win': home_win,
+            'draw': draw,
+            'away_win': 1.0 - home_win - draw,
+            'over_2_5': over_2_5,
+            'under_2_5': 1.0 - over_2_5,
+            'btts': btts
+        }
+        
+        return {
+            'minute': minute,
+            'current_score': f"{home_score}-{away_score}",
+            'expected_home_goals_remaining': inplay_slice['expected_home_goals_remaining'],
+            'expected_away_goals_remaining': inplay_slice['expected_away_goals_remaining'],
+            'final_scores': final_scores,
+            'markets': {
+                market: {
+                    'probability': round(p * 100, 3),
+                    'fair_odds': round(1 / p, 2) if p > 1e-9 else 999
+                }
+                for market, p in markets.items()
+            }
+        }
+    
+    def bootstrap_score_probabilities(self, home_team: str, away_team: str, n_resamples: int = 2000,
+                                      confidence: float = 0.90, batch_size: int = 250,
+                                      n_jobs: Optional[int] = None, seed: Optional[int] = None) -> Dict:
+        """Intervalos de confiança bootstrap para as probabilidades de cada placar
+        
+        Reamostra o histórico de partidas com reposição em lotes vetorizados e
+        recalcula a força de todos os times em cada reamostragem. Com n_jobs > 1
+        os lotes são distribuídos entre processos.
+        """
+        if n_resamples < 1 or batch_size < 1:
+            raise ValueError("n_resamples e batch_size devem ser positivos")
+        if not 0 < confidence < 1:
+            raise ValueError("confidence deve estar entre 0 e 1")
+        if home_team not in self.team_stats or away_team not in self.team_stats:
+            return {}
+        
+        seeds = np.random.SeedSequence(seed).spawn(math.ceil(n_resamples / batch_size))
+        sizes = [min(batch_size, n_resamples - i * batch_size) for i in range(len(seeds))]
+        args = (self.home_idx, self.away_idx, self.home_goals, self.away_goals, len(self.team_names),
+                self.team_index[home_team], self.team_index[away_team])
+        
+        if n_jobs and n_jobs > 1:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                batches = list(executor.map(
+                    _bootstrap_score_batch, *zip(*[args + (size, batch_seed) for size, batch_seed in zip(sizes, seeds)])
+                ))
+        else:
+            batches = [_bootstrap_score_batch(*args, size, batch_seed) for size, batch_seed in zip(sizes, seeds)]
+        
+        samples = np.concatenate(batches) * 100
+        alpha = (1 - confidence) / 2
+        lower, upper = np.quantile(samples, [alpha, 1 - alpha], axis=0)
+        std = samples.std(axis=0)
+        
+        point_estimates = self.calculate_score_probabilities(home_team, away_team)
+        intervals = {}
+        for score, prob_data in point_estimates.items():
+            home_goals, away_goals = (int(goals) for goals in score.split('-'))
+            i = home_goals * (MAX_SCORE_GOALS + 1) + away_goals
+            intervals[score] = {
+                'probability': prob_data['probability'],
+                'lower': round(float(lower[i]), 3),
+                'upper': round(float(upper[i]), 3),
+                'std': round(float(std[i]), 3)
+            }
+        
+        return intervals
+    
+    def find_value_bets(self, home_team: str, away_team: str, available_odds: Dict,
+                        use_confidence_intervals: bool = False, **bootstrap_kwargs) -> List[Dict]:
+        """Identifica value bets comparando probabilidades com odds disponíveis
+        
+        O EV é p * odd - 1 (em %); a odd oferecida precisa superar a odd justa.
+        Com use_confidence_intervals=True o value bet só é sinalizado quando o EV
+        calculado com o limite inferior do intervalo bootstrap (p_inferior * odd - 1)
+        passa de 5%, o que protege contra times com poucos jogos.
+        """
+        if use_confidence_intervals:
+            return self._find_conservative_value_bets(home_team, away_team, available_odds, **bootstrap_kwargs)
+        
         probabilities = self.calculate_score_probabilities(home_team, away_team)
         value_bets = []
         
@@ -138,8 +508,8 @@ class ScoreProbabilityAnalyzer:
                 fair_odds = prob_data['fair_odds']
                 available_odd = available_odds[score]
                 
-                # Calcula valor esperado
-                expected_value = (fair_odds / available_odd - 1) * 100
+                # Valor esperado por unidade apostada: p * odd - 1
+                expected_value = (prob_data['probability'] / 100 * available_odd - 1) * 100
                 
                 if expected_value > 5:  # Value bet se EV > 5%
                     value_bets.append({
@@ -153,6 +523,33 @@ class ScoreProbabilityAnalyzer:
         
         return sorted(value_bets, key=lambda x: x['expected_value'], reverse=True)
     
+    def _find_conservative_value_bets(self, home_team: str, away_team: str, available_odds: Dict,
+                                      **bootstrap_kwargs) -> List[Dict]:
+        intervals = self.bootstrap_score_probabilities(home_team, away_team, **bootstrap_kwargs)
+        value_bets = []
+        
+        for score, interval in intervals.items():
+            if score not in available_odds:
+                continue
+            available_odd = available_odds[score]
+            expected_value = (interval['probability'] / 100 * available_odd - 1) * 100
+            expected_value_lower = (interval['lower'] / 100 * available_odd - 1) * 100
+            
+            if expected_value_lower > 5:  # Value bet se EV no limite inferior > 5%
+                value_bets.append({
+                    'score': score,
+                    'probability': interval['probability'],
+                    'probability_lower': interval['lower'],
+                    'probability_upper': interval['upper'],
+                    'fair_odds': round(100 / interval['probability'], 2) if interval['probability'] > 0 else 999,
+                    'available_odds': available_odd,
+                    'expected_value': round(expected_value, 1),
+                    'expected_value_lower': round(expected_value_lower, 1),
+                    'confidence': 'Alta' if expected_value_lower > 15 else 'Média'
+                })
+        
+        return sorted(value_bets, key=lambda x: x['expected_value_lower'], reverse=True)
+    
     def analyze_common_scores(self) -> Dict:
         """Analisa os placares mais comuns no campeonato"""
         # Conta frequência de placares reais
@@ -179,48 +576,50 @@ class ScoreProbabilityAnalyzer:
             reverse=True
         ))
     
+    def get_team_matches(self, team: str) -> pd.DataFrame:
+        """Partidas (como mandante ou visitante) de um time"""
+        return self.df_all[(self.df_all['home_team'] == team) | (self.df_all['away_team'] == team)]
+    
     def get_team_score_profiles(self) -> Dict:
         """Analisa perfis de placar por time"""
-        team_profiles = {}
+        return {team: self.get_team_score_profile(team) for team in self.team_stats.keys()}
+    
+    def get_team_score_profile(self, team: str, team_matches: pd.DataFrame = None) -> Dict:
+        """Perfil de placar de um time; depende apenas das partidas desse time"""
+        if team_matches is None:
+            team_matches = self.get_team_matches(team)
         
-        for team in self.team_stats.keys():
-            team_matches = self.df_all[
-                (self.df_all['home_team'] == team) | (self.df_all['away_team'] == team)
-            ]
-            
-            # Placaes mais frequentes envolvendo o time
-            score_frequencies = {}
-            for _, match in team_matches.iterrows():
-                if match['home_team'] == team:
-                    score = f"{int(match['home_score'])}-{int(match['away_score'])}"
-                else:
-                    score = f"{int(match['away_score'])}-{int(match['home_score'])}"
-                
-                score_frequencies[score] = score_frequencies.get(score, 0) + 1
-            
-            # Top 5 placares mais comuns
-            top_scores = dict(sorted(
-                score_frequencies.items(), 
-                key=lambda x: x[1], 
-                reverse=True
-            )[:5])
+        # Placaes mais frequentes envolvendo o time
+        score_frequencies = {}
+        for _, match in team_matches.iterrows():
+            if match['home_team'] == team:
+                score = f"{int(match['home_score'])}-{int(match['away_score'])}"
+            else:
+                score = f"{int(match['away_score'])}-{int(match['home_score'])}"
             
-            # Estatísticas de gols
-            home_goals = team_matches[team_matches['home_team'] == team]['home_score'].mean()
-            away_goals = team_matches[team_matches['away_team'] == team]['away_score'].mean()
-            goals_conceded_home = team_matches[team_matches['home_team'] == team]['away_score'].mean()
-            goals_conceded_away = team_matches[team_matches['away_team'] == team]['home_score'].mean()
-            
-            team_profiles[team] = {
-                'top_scores': top_scores,
-                'avg_goals_scored_home': round(home_goals, 2),
-                'avg_goals_scored_away': round(away_goals, 2),
-                'avg_goals_conceded_home': round(goals_conceded_home, 2),
-                'avg_goals_conceded_away': round(goals_conceded_away, 2),
-                'clean_sheets_home': len(team_matches[(team_matches['home_team'] == team) & 
-                                                    (team_matches['away_score'] == 0)]) / len(team_matches[team_matches['home_team'] == team]) * 100,
-                'clean_sheets_away': len(team_matches[(team_matches['away_team'] == team) & 
-                                                    (team_matches['home_score'] == 0)]) / len(team_matches[team_matches['away_team'] == team]) * 100
-            }
+            score_frequencies[score] = score_frequencies.get(score, 0) + 1
+        
+        # Top 5 placares mais comuns
+        top_scores = dict(sorted(
+            score_frequencies.items(), 
+            key=lambda x: x[1], 
+            reverse=True
+        )[:5])
+        
+        # Estatísticas de gols
+        home_goals = team_matches[team_matches['home_team'] == team]['home_score'].mean()
+        away_goals = team_matches[team_matches['away_team'] == team]['away_score'].mean()
+        goals_conceded_home = team_matches[team_matches['home_team'] == team]['away_score'].mean()
+        goals_conceded_away = team_matches[team_matches['away_team'] == team]['home_score'].mean()
         
-        return team_profiles
+        return {
+            'top_scores': top_scores,
+            'avg_goals_scored_home': round(home_goals, 2),
+            'avg_goals_scored_away': round(away_goals, 2),
+            'avg_goals_conceded_home': round(goals_conceded_home, 2),
+            'avg_goals_conceded_away': round(goals_conceded_away, 2),
+            'clean_sheets_home': len(team_matches[(team_matches['home_team'] == team) & 
+                                                (team_matches['away_score'] == 0)]) / len(team_matches[team_matches['home_team'] == team]) * 100,
+            'clean_sheets_away': len(team_matches[(team_matches['away_team'] == team) & 
+                                                (team_matches['home_score'] == 0)]) / len(team_matches[team_matches['away_team'] == team]) * 100
+        }
@@ -1,61 +1,226 @@
 # analysts/score_report_generator.py
+import csv
+import hashlib
 import json
+import os
+import pickle
+import tempfile
 import pandas as pd
+from contextlib import nullcontext
 from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from analysts.odds_scanner import OddsScanner
+from analysts.stage_profiler import StageProfiler
+
+# Incrementar quando a lógica de alguma seção mudar, para invalidar o cache em disco
+CACHE_VERSION = 2
+
+def _hash_key(*parts) -> str:
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=float)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+def _hash_frame(df: pd.DataFrame) -> str:
+    hashed = pd.util.hash_pandas_object(df, index=False)
+    return hashlib.sha256(hashed.values.tobytes()).hexdigest()[:16]
 
 class ScoreReportGenerator:
-    def __init__(self, score_analyzer):
+    # Colunas que definem uma partida para efeito de cache
+    MATCH_COLUMNS = ['home_team', 'away_team', 'home_score', 'away_score']
+    
+    COMMON_MATCHES = [
+        {'home': 'Flamengo', 'away': 'Palmeiras', 'description': 'Clássico nacional'},
+        {'home': 'São Paulo', 'away': 'Corinthians', 'description': 'Majestoso'},
+        {'home': 'Grêmio', 'away': 'Internacional', 'description': 'Grenal'},
+        {'home': 'Flamengo', 'away': 'Fluminense', 'description': 'Fla-Flu'},
+        {'home': 'Atlético-MG', 'away': 'Cruzeiro', 'description': 'Clássico Mineiro'}
+    ]
+    
+    def __init__(self, score_analyzer, profiler: Optional[StageProfiler] = None,
+                 cache_dir: Optional[str] = '.cache_relatorio', odds_snapshot: Optional[str] = None):
         self.analyzer = score_analyzer
+        self.profiler = profiler
+        self.odds_snapshot = odds_snapshot
+        self.cache_dir = cache_dir
+        self._dataset_hash = None
+        self._cache_hits = 0
+        self._cache_misses = 0
+    
+    def _stage(self, name: str):
+        """Registra a etapa no profiler, se houver um configurado"""
+        return self.profiler.stage(name) if self.profiler else nullcontext()
+    
+    def dataset_hash(self) -> str:
+        """Hash estável das partidas analisadas"""
+        if self._dataset_hash is None:
+            self._dataset_hash = _hash_frame(self.analyzer.df_all[self.MATCH_COLUMNS])
+        return self._dataset_hash
+    
+    def _odds_snapshot_hash(self) -> str:
+        digest = hashlib.sha256()
+        with open(self.odds_snapshot, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()[:16]
+    
+    def _cache_path(self, section: str, key: str) -> str:
+        return os.path.join(self.cache_dir, section, f"v{CACHE_VERSION}-{key}.pkl")
+    
+    def _cached(self, section: str, key: str, compute):
+        """Lê o item do cache em disco ou o calcula e grava
+        
+        A chave deve ser derivada apenas dos dados que compute() lê, para que
+        itens cujas entradas não mudaram sejam reaproveitados.
+        """
+        if not self.cache_dir:
+            self._cache_misses += 1
+            return compute()
+        
+        path = self._cache_path(section, key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)['value']
+            self._cache_hits += 1
+            return value
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError):
+            pass
+        
+        self._cache_misses += 1
+        value = compute()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump({'value': value}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return value
     
     def generate_complete_score_report(self) -> Dict:
-        """Gera relatório completo de placar correto"""
+        """Gera relatório completo de placar correto
+        
+        Cada seção é cacheada em disco pelas entradas que realmente lê: placares
+        comuns pelo dataset inteiro, perfis por time (partidas do time) e previsões
+        por confronto (forças dos dois times e médias da liga). Uma nova rodada só
+        recalcula os itens afetados.
+        """
         print("🎯 Analisando probabilidades de placar correto...")
         
-        report = {
-            'metadata': {
+        with self._stage('metadata'):
+            metadata = {
                 'gerado_em': datetime.now().isoformat(),
                 'total_jogos_analisados': len(self.analyzer.all_matches),
-                'media_gols_por_jogo': round(self.analyzer.df_all['total_goals'].mean(), 2)
-            },
-            'placares_mais_comuns': self.analyzer.analyze_common_scores(),
-            'perfis_times': self.analyzer.get_team_score_profiles(),
-            'previsoes_jogos_futuros': self._generate_future_predictions(),
-            'estrategias_placar_correto': self._generate_score_strategies(),
-            'value_bets_simulados': self._simulate_value_bets()
+                'media_gols_por_jogo': round(self.analyzer.df_all['total_goals'].mean(), 2),
+                'hash_dataset': self.dataset_hash()
+            }
+        
+        with self._stage('placares_mais_comuns'):
+            common_scores = self._cached(
+                'placares_mais_comuns', self.dataset_hash(), self.analyzer.analyze_common_scores
+            )
+        with self._stage('perfis_times'):
+            team_profiles = self._generate_team_profiles()
+        with self._stage('previsoes_jogos_futuros'):
+            future_predictions = self._generate_future_predictions()
+        with self._stage('estrategias_placar_correto'):
+            strategies = self._cached('estrategias_placar_correto', 'static', self._generate_score_strategies)
+        with self._stage('value_bets_simulados'):
+            if self.odds_snapshot:
+                value_bets = self._cached(
+                    'value_bets', _hash_key(self.dataset_hash(), self._odds_snapshot_hash()), self._scan_value_bets
+                )
+            else:
+                value_bets = self._simulate_value_bets()
+        
+        print(f"   • Itens recalculados: {self._cache_misses} | lidos do cache: {self._cache_hits}")
+        
+        report = {
+            'metadata': metadata,
+            'placares_mais_comuns': common_scores,
+            'perfis_times': team_profiles,
+            'previsoes_jogos_futuros': future_predictions,
+            'estrategias_placar_correto': strategies,
+            'value_bets_simulados': value_bets
         }
         
         return report
     
+    def _generate_team_profiles(self) -> Dict:
+        """Perfis por time, cada um cacheado pelo hash das partidas do próprio time"""
+        team_profiles = {}
+        for team in self.analyzer.team_stats.keys():
+            team_matches = self.analyzer.get_team_matches(team)
+            key = _hash_key(team, _hash_frame(team_matches[self.MATCH_COLUMNS]))
+            team_profiles[team] = self._cached(
+                'perfis_times', key,
+                lambda: self.analyzer.get_team_score_profile(team, team_matches)
+            )
+        return team_profiles
+    
+    def save_json_report(self, report: Dict, path: str):
+        """Grava o relatório em JSON, serializando uma entrada de cada seção por vez"""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{\n')
+            for i, (section, content) in enumerate(report.items()):
+                f.write(',\n' if i else '')
+                f.write(f'  {json.dumps(section, ensure_ascii=False)}: ')
+                if isinstance(content, dict) and content:
+                    f.write('{\n')
+                    for j, (key, value) in enumerate(content.items()):
+                        f.write(',\n' if j else '')
+                        f.write(f'    {json.dumps(key, ensure_ascii=False, default=str)}: ')
+                        f.write(json.dumps(value, ensure_ascii=False, default=str))
+                    f.write('\n  }')
+                elif isinstance(content, list) and content:
+                    f.write('[\n')
+                    for j, item in enumerate(content):
+                        f.write(',\n' if j else '')
+                        f.write(f'    {json.dumps(item, ensure_ascii=False, default=str)}')
+                    f.write('\n  ]')
+                else:
+                    f.write(json.dumps(content, ensure_ascii=False, default=str))
+            f.write('\n}\n')
+    
     def _generate_future_predictions(self) -> Dict:
-        """Gera previsões para jogos futuros baseados em confrontos similares"""
-        # Times mais comuns do Brasileirão
-        common_matches = [
-            {'home': 'Flamengo', 'away': 'Palmeiras', 'description': 'Clássico nacional'},
-            {'home': 'São Paulo', 'away': 'Corinthians', 'description': 'Majestoso'},
-            {'home': 'Grêmio', 'away': 'Internacional', 'description': 'Grenal'},
-            {'home': 'Flamengo', 'away': 'Fluminense', 'description': 'Fla-Flu'},
-            {'home': 'Atlético-MG', 'away': 'Cruzeiro', 'description': 'Clássico Mineiro'}
-        ]
+        """Gera previsões para jogos futuros baseados em confrontos similares
         
+        Cada confronto é cacheado pelas forças dos dois times e pelas médias da liga,
+        que são as únicas entradas de calculate_score_probabilities.
+        """
+        league_averages = (
+            float(self.analyzer.df_all['home_score'].mean()), float(self.analyzer.df_all['away_score'].mean())
+        )
         predictions = {}
         
-        for match in common_matches:
+        # Times mais comuns do Brasileirão
+        for match in self.COMMON_MATCHES:
             home, away = match['home'], match['away']
-            probabilities = self.analyzer.calculate_score_probabilities(home, away)
-            
-            if probabilities:
-                predictions[f"{home} vs {away}"] = {
-                    'description': match['description'],
-                    'top_5_placares': dict(list(probabilities.items())[:5]),
-                    'placar_mais_provavel': list(probabilities.items())[0],
-                    'expectativa_gols': {
-                        'home': list(probabilities.values())[0]['expected_home_goals'],
-                        'away': list(probabilities.values())[0]['expected_away_goals']
-                    }
-                }
+            key = _hash_key(
+                match, self.analyzer.team_stats.get(home), self.analyzer.team_stats.get(away), league_averages
+            )
+            prediction = self._cached('previsoes_jogos_futuros', key, lambda: self._predict_match(match))
+            if prediction:
+                predictions[f"{home} vs {away}"] = prediction
         
         return predictions
     
+    def _predict_match(self, match: Dict) -> Optional[Dict]:
+        probabilities = self.analyzer.calculate_score_probabilities(match['home'], match['away'])
+        if not probabilities:
+            return None
+        
+        return {
+            'description': match['description'],
+            'top_5_placares': dict(list(probabilities.items())[:5]),
+            'placar_mais_provavel': list(probabilities.items())[0],
+            'expectativa_gols': {
+                'home': list(probabilities.values())[0]['expected_home_goals'],
+                'away': list(probabilities.values())[0]['expected_away_goals']
+            }
+        }
+    
     def _generate_score_strategies(self) -> Dict:
         """Gera estratégias específicas para apostas em placar correto"""
         strategies = {
@@ -124,53 +289,67 @@ class ScoreReportGenerator:
         
         return example_bets
     
+    @staticmethod
+    def _write_csv(path: str, header: List[str], rows: Iterable):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+    
+    def _scan_value_bets(self, top_n: int = 50) -> List[Dict]:
+        """Value bets reais a partir do snapshot de odds (melhor preço entre as casas)"""
+        value_bets = OddsScanner(self.analyzer).scan_file(self.odds_snapshot, top_n=top_n)
+        value_bets['confianca'] = ['Alta' if ev > 15 else 'Média' for ev in value_bets['value_esperado']]
+        value_bets['value_esperado'] = [f"+{ev:.1f}%" for ev in value_bets['value_esperado']]
+        return value_bets.to_dict('records')
+    
     def generate_score_csv_reports(self, report: Dict):
         """Gera relatórios em CSV para análise detalhada"""
         
         # CSV de placares mais comuns
-        common_scores_data = []
-        for score, stats in report['placares_mais_comuns'].items():
-            common_scores_data.append({
-                'placar': score,
-                'frequencia': stats['frequency'],
-                'percentual': stats['percentage'],
-                'odds_justas': stats['fair_odds']
-            })
-        
-        pd.DataFrame(common_scores_data).to_csv('placares_mais_comuns.csv', index=False, encoding='utf-8')
+        self._write_csv(
+            'placares_mais_comuns.csv',
+            ['placar', 'frequencia', 'percentual', 'odds_justas'],
+            (
+                (score, stats['frequency'], stats['percentage'], stats['fair_odds'])
+                for score, stats in report['placares_mais_comuns'].items()
+            )
+        )
         
         # CSV de perfis dos times
-        teams_profile_data = []
-        for team, profile in report['perfis_times'].items():
-            top_score = list(profile['top_scores'].items())[0] if profile['top_scores'] else ('0-0', 0)
-            teams_profile_data.append({
-                'time': team,
-                'placar_mais_comum': top_score[0],
-                'frequencia_placar': top_score[1],
-                'media_gols_casa': profile['avg_goals_scored_home'],
-                'media_gols_fora': profile['avg_goals_scored_away'],
-                'media_gols_sofridos_casa': profile['avg_goals_conceded_home'],
-                'media_gols_sofridos_fora': profile['avg_goals_conceded_away'],
-                'clean_sheets_casa': round(profile['clean_sheets_home'], 1),
-                'clean_sheets_fora': round(profile['clean_sheets_away'], 1)
-            })
-        
-        pd.DataFrame(teams_profile_data).to_csv('perfis_placar_times.csv', index=False, encoding='utf-8')
+        def team_profile_rows():
+            for team, profile in report['perfis_times'].items():
+                top_score = next(iter(profile['top_scores'].items()), ('0-0', 0))
+                yield (
+                    team,
+                    top_score[0],
+                    top_score[1],
+                    profile['avg_goals_scored_home'],
+                    profile['avg_goals_scored_away'],
+                    profile['avg_goals_conceded_home'],
+                    profile['avg_goals_conceded_away'],
+                    round(profile['clean_sheets_home'], 1),
+                    round(profile['clean_sheets_away'], 1)
+                )
+        
+        self._write_csv(
+            'perfis_placar_times.csv',
+            ['time', 'placar_mais_comum', 'frequencia_placar', 'media_gols_casa', 'media_gols_fora',
+             'media_gols_sofridos_casa', 'media_gols_sofridos_fora', 'clean_sheets_casa', 'clean_sheets_fora'],
+            team_profile_rows()
+        )
         
         # CSV de previsões
-        predictions_data = []
-        for match, prediction in report['previsoes_jogos_futuros'].items():
-            for score, prob in prediction['top_5_placares'].items():
-                predictions_data.append({
-                    'jogo': match,
-                    'placar': score,
-                    'probabilidade': prob['probability'],
-                    'odds_justas': prob['fair_odds'],
-                    'expectativa_gols_casa': prediction['expectativa_gols']['home'],
-                    'expectativa_gols_fora': prediction['expectativa_gols']['away']
-                })
-        
-        pd.DataFrame(predictions_data).to_csv('previsoes_placares.csv', index=False, encoding='utf-8')
+        self._write_csv(
+            'previsoes_placares.csv',
+            ['jogo', 'placar', 'probabilidade', 'odds_justas', 'expectativa_gols_casa', 'expectativa_gols_fora'],
+            (
+                (match, score, prob['probability'], prob['fair_odds'],
+                 prediction['expectativa_gols']['home'], prediction['expectativa_gols']['away'])
+                for match, prediction in report['previsoes_jogos_futuros'].items()
+                for score, prob in prediction['top_5_placares'].items()
+            )
+        )
         
         print("✅ CSVs para placar correto gerados:")
         print("   - placares_mais_comuns.csv")
@@ -0,0 +1,123 @@
+# analysts/stage_profiler.py
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+class StageProfiler:
+    """Mede tempo de parede, tempo de CPU e, opcionalmente, pico de memória de cada etapa
+
+    A medição de memória usa tracemalloc, que deixa o código Python várias vezes
+    mais lento; por isso fica desligada por padrão e os tempos registrados com
+    ela ligada não devem ser comparados aos tempos sem ela. O pico é relativo à
+    memória rastreada no início da etapa, sem contar o que etapas anteriores
+    ainda mantêm alocado.
+    """
+
+    def __init__(self, track_memory: bool = False):
+        self.track_memory = track_memory
+        self.stages: List[Dict] = []
+        self._started_at = datetime.now().isoformat()
+        self._lock = threading.Lock()
+        self._started_tracing = False
+
+    def _ensure_tracing(self):
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+
+    def stop(self):
+        """Encerra o tracemalloc se ele foi iniciado por este profiler"""
+        with self._lock:
+            if self._started_tracing and tracemalloc.is_tracing():
+                tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str):
+        """Context manager que registra as métricas de uma etapa do pipeline"""
+        memory_start = None
+        if self.track_memory:
+            self._ensure_tracing()
+            tracemalloc.reset_peak()
+            memory_start, _ = tracemalloc.get_traced_memory()
+
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - wall_start
+            cpu_time = time.thread_time() - cpu_start
+
+            peak_memory = None
+            if memory_start is not None and tracemalloc.is_tracing():
+                _, peak = tracemalloc.get_traced_memory()
+                peak_memory = max(0, peak - memory_start)
+
+            self.stages.append({
+                'etapa': name,
+                'wall_time_s': round(wall_time, 6),
+                'cpu_time_s': round(cpu_time, 6),
+                'pico_memoria_mb': round(peak_memory / (1024 * 1024), 3) if peak_memory is not None else None
+            })
+
+    def summary(self) -> Dict:
+        """Retorna as métricas coletadas em formato serializável"""
+        return {
+            'iniciado_em': self._started_at,
+            'soma_wall_time_s': round(sum(s['wall_time_s'] for s in self.stages), 6),
+            'soma_cpu_time_s': round(sum(s['cpu_time_s'] for s in self.stages), 6),
+            'etapas': self.stages
+        }
+
+    def save(self, path: str):
+        """Salva as métricas em JSON e encerra a medição de memória"""
+        self.stop()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2, ensure_ascii=False)
+
+    def print_summary(self):
+        """Exibe tabela resumida das etapas"""
+        print("\n⏱️  TEMPO POR ETAPA:")
+        for s in self.stages:
+            memory = f" | pico {s['pico_memoria_mb']} MB" if s['pico_memoria_mb'] is not None else ""
+            print(f"   • {s['etapa']}: {s['wall_time_s']:.3f}s parede | {s['cpu_time_s']:.3f}s CPU{memory}")
+
+@contextmanager
+def profile_run(output_path: str, backend: str = 'cprofile'):
+    """Executa o bloco sob cProfile ou pyinstrument e salva o resultado em disco"""
+    if backend == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("⚠️ pyinstrument não instalado, usando cProfile")
+            backend = 'cprofile'
+
+    if backend == 'pyinstrument':
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(profiler.output_html())
+    else:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(output_path)
+
+def default_profile_path(backend: Optional[str], base_path: str) -> str:
+    """Caminho do dump de profiling ao lado do relatório"""
+    stem = base_path.rsplit('.', 1)[0]
+    return f"{stem}_profile.html" if backend == 'pyinstrument' else f"{stem}.prof"
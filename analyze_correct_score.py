@@ -1,24 +1,80 @@
 # analyze_correct_score.py
 #!/usr/bin/env python3
+import argparse
 import json
+import os
+from contextlib import nullcontext
+from analysts.analyzer_snapshot import load_or_build_analyzer
 from analysts.score_analyzer import ScoreProbabilityAnalyzer
 from analysts.score_report_generator import ScoreReportGenerator
+from analysts.stage_profiler import StageProfiler, profile_run, default_profile_path
+
+DATA_PATH = 'brasileirao_collection_results.json'
+REPORT_PATH = 'relatorio_placar_correto.json'
+TIMINGS_PATH = 'relatorio_placar_correto_timings.json'
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Análise de placar correto - Brasileirão")
+    parser.add_argument(
+        '--profile', nargs='?', const='cprofile', choices=['cprofile', 'pyinstrument'],
+        help="Gera dump de profiling (cProfile por padrão) ao lado do relatório"
+    )
+    parser.add_argument(
+        '--trace-memory', action='store_true',
+        help="Mede o pico de memória de cada etapa (tracemalloc deixa a execução mais lenta)"
+    )
+    parser.add_argument('--no-cache', action='store_true', help="Recalcula todas as seções do relatório")
+    parser.add_argument('--odds', help="Snapshot de odds (CSV/NDJSON) para buscar value bets reais")
+    parser.add_argument(
+        '--snapshot', nargs='?', const='analyzer_snapshot.npz',
+        help="Usa (e atualiza) o snapshot binário do analisador em vez de recalcular as estatísticas"
+    )
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+    profiler_context = (
+        profile_run(default_profile_path(args.profile, REPORT_PATH), args.profile)
+        if args.profile else nullcontext()
+    )
+    with profiler_context:
+        run_analysis(
+            use_cache=not args.no_cache,
+            odds_snapshot=args.odds, snapshot_path=args.snapshot,
+            trace_memory=args.trace_memory
+        )
+    if args.profile:
+        print(f"🔬 Profiling salvo em {default_profile_path(args.profile, REPORT_PATH)}")
+
+def run_analysis(use_cache: bool = True, odds_snapshot: str = None,
+                 snapshot_path: str = None, trace_memory: bool = False):
     print("🎯 ANÁLISE DE PLACAR CORRETO - BRASILEIRÃO")
     print("=" * 60)
     
-    # Carrega dados históricos
-    try:
-        with open('brasileirao_collection_results.json', 'r', encoding='utf-8') as f:
-            historical_data = json.load(f)
-    except FileNotFoundError:
+    profiler = StageProfiler(track_memory=trace_memory)
+    
+    if not os.path.exists(DATA_PATH):
         print("❌ Arquivo de dados não encontrado. Execute primeiro a coleta.")
         return
     
-    # Inicializa analisador
-    analyzer = ScoreProbabilityAnalyzer(historical_data)
-    report_generator = ScoreReportGenerator(analyzer)
+    if snapshot_path:
+        # Snapshot em dia com os dados evita recalcular as estatísticas dos times
+        with profiler.stage('carregar_snapshot'):
+            analyzer = load_or_build_analyzer(DATA_PATH, snapshot_path)
+    else:
+        # Carrega dados históricos
+        with profiler.stage('carregar_dados'):
+            with open(DATA_PATH, 'r', encoding='utf-8') as f:
+                historical_data = json.load(f)
+        
+        # Inicializa analisador
+        with profiler.stage('estatisticas_times'):
+            analyzer = ScoreProbabilityAnalyzer(historical_data)
+    report_generator = ScoreReportGenerator(
+        analyzer, profiler=profiler,
+        cache_dir='.cache_relatorio' if use_cache else None,
+        odds_snapshot=odds_snapshot
+    )
     
     # Gera relatório completo
     print("1. 📊 Calculando probabilidades de Poisson...")
@@ -30,11 +86,15 @@ def main():
     score_report = report_generator.generate_complete_score_report()
     
     # Salva relatório
-    with open('relatorio_placar_correto.json', 'w', encoding='utf-8') as f:
-        json.dump(score_report, f, indent=2, ensure_ascii=False, default=str)
+    with profiler.stage('salvar_json'):
+        report_generator.save_json_report(score_report, REPORT_PATH)
     
     # Gera CSVs
-    report_generator.generate_score_csv_reports(score_report)
+    with profiler.stage('salvar_csvs'):
+        report_generator.generate_score_csv_reports(score_report)
+    
+    profiler.save(TIMINGS_PATH)
+    profiler.print_summary()
     
     # Exibe insights principais
     print("\n🎯 PRINCIPAIS INSIGHTS - PLACAR CORRETO")
@@ -76,6 +136,7 @@ def main():
     print("✅ ANÁLISE DE PLACAR CORRETO CONCLUÍDA!")
     print("📁 Arquivos gerados:")
     print("   • relatorio_placar_correto.json")
+    print("   • relatorio_placar_correto_timings.json")
     print("   • placares_mais_comuns.csv")
     print("   • perfis_placar_times.csv")
     print("   • previsoes_placares.csv")
@@ -0,0 +1,31 @@
+# app/api/analysis.py
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from typing import Dict
+import logging
+
+from app.services.analyzer_service import get_dataset_version, get_score_probabilities
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.get("/analysis/score-probabilities", response_model=Dict)
+async def score_probabilities(
+    home_team: str = Query(..., description="Time mandante"),
+    away_team: str = Query(..., description="Time visitante")
+):
+    """Calcula probabilidades de placar correto"""
+    try:
+        probabilities = await run_in_threadpool(get_score_probabilities, home_team, away_team)
+    except Exception as e:
+        logger.error(f"Erro ao calcular probabilidades: {e}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor")
+
+    if not probabilities:
+        raise HTTPException(status_code=404, detail="Time sem estatísticas no dataset")
+    return {
+        "home_team": home_team,
+        "away_team": away_team,
+        "dataset_version": get_dataset_version(),
+        "probabilities": probabilities
+    }
@@ -1,12 +1,15 @@
 # app/api/endpoints.py
 from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional, List, Dict
 import logging
+import time
 
+from app.core.metrics import DATA_REFRESH_DURATION
+from app.services.analyzer_service import refresh_score_analyzer
 from app.services.data_service import DataService, get_data_service
 from app.models.schemas import (
-    TeamResponse, MatchResponse, ScoreProbabilityResponse,
-    PlayerStatsResponse, BettingAnalysisResponse
+    TeamResponse, MatchResponse, BettingAnalysisResponse
 )
 
 router = APIRouter()
@@ -44,34 +47,6 @@ async def get_matches(
         logger.error(f"Erro ao buscar partidas: {e}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
 
-@router.get("/analysis/score-probabilities", response_model=ScoreProbabilityResponse)
-async def get_score_probabilities(
-    home_team: str = Query(..., description="Time mandante"),
-    away_team: str = Query(..., description="Time visitante"),
-    data_service: DataService = Depends(get_data_service)
-):
-    """Calcula probabilidades de placar correto"""
-    try:
-        probabilities = await data_service.calculate_score_probabilities(home_team, away_team)
-        return probabilities
-    except Exception as e:
-        logger.error(f"Erro ao calcular probabilidades: {e}")
-        raise HTTPException(status_code=500, detail="Erro interno do servidor")
-
-@router.get("/analysis/player-stats", response_model=List[PlayerStatsResponse])
-async def get_player_stats(
-    team: Optional[str] = Query(None, description="Filtrar por time"),
-    position: Optional[str] = Query(None, description="Filtrar por posição"),
-    data_service: DataService = Depends(get_data_service)
-):
-    """Retorna estatísticas de jogadores"""
-    try:
-        stats = await data_service.get_player_stats(team, position)
-        return stats
-    except Exception as e:
-        logger.error(f"Erro ao buscar estatísticas de jogadores: {e}")
-        raise HTTPException(status_code=500, detail="Erro interno do servidor")
-
 @router.get("/analysis/betting-insights", response_model=BettingAnalysisResponse)
 async def get_betting_insights(
     home_team: str = Query(..., description="Time mandante"),
@@ -94,7 +69,10 @@ async def update_data(
 ):
     """Força atualização dos dados"""
     try:
+        start = time.perf_counter()
         result = await data_service.update_league_data(league, season)
+        DATA_REFRESH_DURATION.observe(time.perf_counter() - start, source='collect')
+        await run_in_threadpool(refresh_score_analyzer)
         return {"status": "success", "message": f"Dados atualizados: {result}"}
     except Exception as e:
         logger.error(f"Erro ao atualizar dados: {e}")
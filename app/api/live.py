@@ -0,0 +1,67 @@
+# app/api/live.py
+from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import Dict
+import logging
+
+from app.services.analyzer_service import get_score_analyzer
+from app.services.live_service import LiveMatchHub, get_live_hub
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.get("/live", response_model=Dict)
+async def list_live_matches(live_hub: LiveMatchHub = Depends(get_live_hub)):
+    """Retorna as odds atuais de todas as partidas ao vivo"""
+    return live_hub.list_matches()
+
+@router.post("/live/{match_id}/start", response_model=Dict)
+async def start_live_match(
+    match_id: str,
+    home_team: str = Query(..., description="Time mandante"),
+    away_team: str = Query(..., description="Time visitante"),
+    live_hub: LiveMatchHub = Depends(get_live_hub)
+):
+    """Inicia o acompanhamento ao vivo de uma partida"""
+    # Fora do loop: uma recarga do analisador não pode travar os streams abertos
+    analyzer = await run_in_threadpool(get_score_analyzer)
+    try:
+        return live_hub.start_match(analyzer, match_id, home_team, away_team)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        logger.error(f"Erro ao iniciar partida ao vivo: {e}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor")
+
+@router.post("/live/{match_id}/events", response_model=Dict)
+async def push_live_event(
+    match_id: str,
+    minute: int = Query(..., ge=0, le=130, description="Minuto atual"),
+    home_score: int = Query(..., ge=0, description="Gols do mandante"),
+    away_score: int = Query(..., ge=0, description="Gols do visitante"),
+    finished: bool = Query(False, description="Partida encerrada"),
+    live_hub: LiveMatchHub = Depends(get_live_hub)
+):
+    """Atualiza minuto/placar de uma partida ao vivo e recalcula as odds"""
+    analyzer = await run_in_threadpool(get_score_analyzer)
+    if live_hub.get_match(match_id) is None:
+        raise HTTPException(status_code=404, detail="Partida ao vivo não encontrada")
+    try:
+        return live_hub.update_match(analyzer, match_id, minute, home_score, away_score, finished)
+    except Exception as e:
+        logger.error(f"Erro ao recalcular odds ao vivo: {e}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor")
+
+@router.get("/live/{match_id}/stream")
+async def stream_live_odds(match_id: str, live_hub: LiveMatchHub = Depends(get_live_hub)):
+    """Envia (Server-Sent Events) as odds recalculadas a cada evento da partida"""
+    if live_hub.get_match(match_id) is None:
+        raise HTTPException(status_code=404, detail="Partida ao vivo não encontrada")
+    return StreamingResponse(
+        live_hub.stream(match_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,52 @@
+# app/api/players.py
+from fastapi import APIRouter, HTTPException, Query, Depends, Response
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional, List, Dict
+import logging
+
+from app.services.player_stats_service import PlayerStatsStore, get_player_stats_store
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.get("/analysis/player-stats", response_model=List[Dict])
+async def get_player_stats(
+    response: Response,
+    team: Optional[str] = Query(None, description="Filtrar por time"),
+    position: Optional[str] = Query(None, description="Filtrar por posição"),
+    season: Optional[str] = Query(None, description="Filtrar por temporada"),
+    limit: int = Query(50, ge=1, le=500, description="Jogadores por página"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em X-Next-Cursor"),
+    store: PlayerStatsStore = Depends(get_player_stats_store)
+):
+    """Retorna estatísticas de jogadores (paginado por cursor no header X-Next-Cursor)"""
+    try:
+        stats, next_cursor = await run_in_threadpool(
+            store.list_player_stats, team, position, season, limit, cursor
+        )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return stats
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Erro ao buscar estatísticas de jogadores: {e}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor")
+
+@router.post("/collect/player-stats")
+async def ingest_player_stats(
+    appearances: List[Dict],
+    store: PlayerStatsStore = Depends(get_player_stats_store)
+):
+    """Ingere participações de jogadores e atualiza os agregados"""
+    try:
+        ingested = await run_in_threadpool(store.ingest_appearances, appearances)
+        return {"status": "success", "ingested": ingested}
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Campo obrigatório ausente: {e}")
+    except (ValueError, TypeError) as e:
+        # match_date fora do formato ISO ou contadores não numéricos
+        raise HTTPException(status_code=400, detail=f"Participação inválida: {e}")
+    except Exception as e:
+        logger.error(f"Erro ao ingerir estatísticas de jogadores: {e}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor")
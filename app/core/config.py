@@ -12,6 +12,10 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./football_stats.db")
     
+    # Dados históricos usados pelo analisador de placar
+    MATCHES_DATA_FILE: str = os.getenv("MATCHES_DATA_FILE", "brasileirao_collection_results.json")
+    ANALYZER_SNAPSHOT_FILE: str = os.getenv("ANALYZER_SNAPSHOT_FILE", "analyzer_snapshot.npz")
+    
     # API Keys
     API_FUTEBOL_KEY: Optional[str] = os.getenv("API_FUTEBOL_KEY")
     
@@ -0,0 +1,242 @@
+# app/core/metrics.py
+import time
+import threading
+from bisect import bisect_left
+from functools import wraps
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+class _Metric:
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+class Counter(_Metric):
+    """Contador monotônico"""
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        lines = self.header()
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+class Gauge(_Metric):
+    """Valor instantâneo que pode subir ou descer"""
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        lines = self.header()
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+class Histogram(_Metric):
+    """Histograma com buckets fixos; observe() é O(log n_buckets) sem alocação"""
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Por série: [contagem por bucket (não cumulativa) + overflow, soma, total]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._series[key] = series
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def time(self, **labels):
+        """Decorador que registra a duração de cada chamada"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - start, **labels)
+            return wrapper
+        return decorator
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(key, (list(s[0]), s[1], s[2])) for key, s in self._series.items()]
+        lines = self.header()
+        for key, (counts, total_sum, total_count) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total_sum)}")
+            lines.append(f"{self.name}_count{labels} {total_count}")
+        return lines
+
+class MetricsRegistry:
+    """Registro em processo; render() gera o formato de exposição do Prometheus"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        lines.extend(_render_cache_hit_ratio())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "Latência das requisições HTTP por rota",
+    labelnames=("method", "route", "status")
+))
+SCORE_PROBABILITIES_DURATION = REGISTRY.register(Histogram(
+    "score_probabilities_compute_seconds", "Tempo de cálculo de calculate_score_probabilities"
+))
+CACHE_HITS = REGISTRY.register(Counter(
+    "cache_hits_total", "Acertos de cache", labelnames=("cache",)
+))
+CACHE_MISSES = REGISTRY.register(Counter(
+    "cache_misses_total", "Falhas de cache", labelnames=("cache",)
+))
+DATA_REFRESH_DURATION = REGISTRY.register(Histogram(
+    "data_refresh_duration_seconds", "Duração da atualização de dados",
+    labelnames=("source",), buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+))
+DATASET_INFO = REGISTRY.register(Gauge(
+    "dataset_info", "Versão do dataset carregado (valor sempre 1)", labelnames=("version",)
+))
+DATASET_LAST_REFRESH = REGISTRY.register(Gauge(
+    "dataset_last_refresh_timestamp_seconds", "Horário (epoch) da última atualização do dataset"
+))
+
+def _render_cache_hit_ratio() -> List[str]:
+    with CACHE_HITS._lock:
+        hits_by_cache = dict(CACHE_HITS._values)
+    with CACHE_MISSES._lock:
+        misses_by_cache = dict(CACHE_MISSES._values)
+    caches = set(hits_by_cache) | set(misses_by_cache)
+    if not caches:
+        return []
+    lines = [
+        "# HELP cache_hit_ratio Proporção de acertos de cache desde o início do processo",
+        "# TYPE cache_hit_ratio gauge",
+    ]
+    for key in sorted(caches):
+        hits = hits_by_cache.get(key, 0.0)
+        total = hits + misses_by_cache.get(key, 0.0)
+        ratio = hits / total if total else 0.0
+        lines.append(f"cache_hit_ratio{_format_labels(('cache',), key)} {_format_value(ratio)}")
+    return lines
+
+def record_cache_access(cache: str, hit: bool):
+    """Registra acerto ou falha em um cache nomeado"""
+    (CACHE_HITS if hit else CACHE_MISSES).inc(cache=cache)
+
+def set_dataset_version(version: str):
+    """Publica a versão do dataset atualmente em uso"""
+    DATASET_INFO.clear()
+    DATASET_INFO.set(1, version=version)
+    DATASET_LAST_REFRESH.set(time.time())
+
+class MetricsMiddleware:
+    """Middleware ASGI puro que mede a latência por rota (template, não o path bruto)"""
+
+    def __init__(self, app, excluded_paths: Optional[Sequence[str]] = ("/metrics",)):
+        self.app = app
+        self.excluded_paths = set(excluded_paths or ())
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status_code)
+            )
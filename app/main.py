@@ -1,15 +1,38 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
 import logging
 
+from app.api import analysis, live, players
+from app.core.metrics import REGISTRY, MetricsMiddleware
+from app.services.analyzer_service import load_score_analyzer
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Carrega o analisador do snapshot para que a primeira requisição não recalcule nada
+    try:
+        await run_in_threadpool(load_score_analyzer)
+    except (OSError, ValueError, KeyError) as e:
+        # Dados ausentes ou em meio a uma escrita: sobe sem o analisador e carrega na primeira requisição
+        logger.warning(f"Analisador não pré-carregado, dados indisponíveis: {e}")
+    yield
+
 app = FastAPI(
     title="Football Stats API",
     description="API de estatísticas de futebol",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+app.add_middleware(MetricsMiddleware)
+app.include_router(analysis.router)
+app.include_router(live.router)
+app.include_router(players.router)
+
 @app.get("/")
 async def root():
     return {"message": "Football Stats API está funcionando!"}
@@ -18,6 +41,10 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/teams")
 async def get_teams():
     return {"teams": ["Flamengo", "Palmeiras", "São Paulo"]}
@@ -0,0 +1,126 @@
+# app/services/analyzer_service.py
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from analysts.analyzer_snapshot import file_checksum, load_snapshot, save_snapshot
+from analysts.score_analyzer import ScoreProbabilityAnalyzer
+from app.core.config import settings
+from app.core.metrics import (
+    DATA_REFRESH_DURATION, SCORE_PROBABILITIES_DURATION,
+    record_cache_access, set_dataset_version
+)
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_reload_lock = threading.Lock()
+_analyzer: Optional[ScoreProbabilityAnalyzer] = None
+_dataset_version: Optional[str] = None
+_data_file: Optional[str] = None
+_data_mtime: Optional[int] = None
+_probability_cache: Dict[Tuple[str, str], Dict] = {}
+
+def _instrument(analyzer: ScoreProbabilityAnalyzer) -> ScoreProbabilityAnalyzer:
+    """Mede o tempo de cada chamada a calculate_score_probabilities"""
+    analyzer.calculate_score_probabilities = SCORE_PROBABILITIES_DURATION.time()(
+        analyzer.calculate_score_probabilities
+    )
+    return analyzer
+
+def _file_mtime(path: Optional[str]) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except (FileNotFoundError, TypeError):
+        return None
+
+def load_score_analyzer(data_file: Optional[str] = None, rebuild: bool = False) -> ScoreProbabilityAnalyzer:
+    """Carrega o analisador do snapshot em disco ou, se desatualizado, reconstrói a partir dos dados
+    
+    Com rebuild=True ignora o snapshot existente; em ambos os casos de reconstrução
+    o snapshot é regravado para os próximos processos.
+    """
+    global _analyzer, _dataset_version, _data_file, _data_mtime, _probability_cache
+    data_file = data_file or settings.MATCHES_DATA_FILE
+    snapshot_path = settings.ANALYZER_SNAPSHOT_FILE
+
+    start = time.perf_counter()
+    # Lido antes do checksum: uma escrita durante a carga provoca nova recarga
+    mtime = _file_mtime(data_file)
+    checksum = file_checksum(data_file)
+    analyzer = None if rebuild else load_snapshot(snapshot_path, checksum)
+    source = 'snapshot'
+    if analyzer is None:
+        with open(data_file, 'r', encoding='utf-8') as f:
+            analyzer = ScoreProbabilityAnalyzer(json.load(f))
+        save_snapshot(analyzer, snapshot_path, checksum)
+        source = 'analyzer'
+    analyzer = _instrument(analyzer)
+    version = checksum[:12]
+    DATA_REFRESH_DURATION.observe(time.perf_counter() - start, source=source)
+
+    with _lock:
+        _analyzer = analyzer
+        _dataset_version = version
+        _data_file = data_file
+        _data_mtime = mtime
+        # Novo dicionário, não clear(): quem ainda segura o analisador antigo grava no cache antigo
+        _probability_cache = {}
+    set_dataset_version(version)
+    logger.info(f"Analisador carregado via {source} (dataset {version}, {len(analyzer.team_stats)} times)")
+    return analyzer
+
+def refresh_score_analyzer(data_file: Optional[str] = None) -> ScoreProbabilityAnalyzer:
+    """Reconstrói o analisador e o snapshot após uma nova ingestão de dados"""
+    return load_score_analyzer(data_file, rebuild=True)
+
+def _data_file_changed() -> bool:
+    mtime = _file_mtime(_data_file)
+    return mtime is not None and mtime != _data_mtime
+
+def get_score_analyzer() -> ScoreProbabilityAnalyzer:
+    """Retorna o analisador em memória, (re)carregando-o se o arquivo de dados mudou
+
+    Quando o coletor regrava o arquivo de dados, a próxima chamada recarrega o
+    analisador; o snapshot já regravado por outro processo é reaproveitado.
+    """
+    if _analyzer is None or _data_file_changed():
+        with _reload_lock:
+            if _analyzer is None:
+                return load_score_analyzer(_data_file)
+            if _data_file_changed():
+                try:
+                    return load_score_analyzer(_data_file)
+                except (OSError, ValueError) as e:
+                    # Arquivo possivelmente em meio a uma escrita; tenta de novo na próxima chamada
+                    logger.warning(f"Recarga do analisador falhou, mantendo a versão {_dataset_version}: {e}")
+    return _analyzer
+
+def get_dataset_version() -> Optional[str]:
+    return _dataset_version
+
+def get_score_probabilities(home_team: str, away_team: str) -> Dict:
+    """Probabilidades de placar com cache por confronto (um cache por versão do analisador)
+
+    Times fora do dataset retornam {} sem passar pelo cache, para que nomes
+    arbitrários não façam o cache crescer.
+    """
+    # Primeiro o analisador: uma recarga por mudança nos dados troca o cache
+    get_score_analyzer()
+    with _lock:
+        analyzer, cache = _analyzer, _probability_cache
+    if home_team not in analyzer.team_stats or away_team not in analyzer.team_stats:
+        return {}
+
+    key = (home_team, away_team)
+    cached = cache.get(key)
+    record_cache_access('score_probabilities', cached is not None)
+    if cached is not None:
+        return cached
+
+    probabilities = analyzer.calculate_score_probabilities(home_team, away_team)
+    cache[key] = probabilities
+    return probabilities
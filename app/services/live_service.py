@@ -0,0 +1,125 @@
+# app/services/live_service.py
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Optional, Set
+
+from analysts.score_analyzer import ScoreProbabilityAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# Atualizações pendentes por assinante; clientes lentos perdem as mais antigas
+SUBSCRIBER_QUEUE_SIZE = 32
+
+@dataclass
+class LiveMatch:
+    match_id: str
+    home_team: str
+    away_team: str
+    minute: int = 0
+    home_score: int = 0
+    away_score: int = 0
+    finished: bool = False
+    odds: Dict = field(default_factory=dict)
+    subscribers: Set[asyncio.Queue] = field(default_factory=set)
+
+class LiveMatchHub:
+    """Mantém o estado das partidas ao vivo e distribui odds recalculadas aos assinantes
+
+    Os métodos rodam no event loop (as filas dos assinantes não são thread-safe);
+    o analisador é resolvido pelo chamador fora do loop, já que uma recarga de
+    dados pode levar centenas de milissegundos.
+    """
+
+    def __init__(self):
+        self._matches: Dict[str, LiveMatch] = {}
+
+    def list_matches(self) -> Dict[str, Dict]:
+        return {match_id: match.odds for match_id, match in self._matches.items()}
+
+    def get_match(self, match_id: str) -> Optional[LiveMatch]:
+        return self._matches.get(match_id)
+
+    def start_match(self, analyzer: ScoreProbabilityAnalyzer, match_id: str, home_team: str,
+                    away_team: str) -> Dict:
+        """Registra uma partida ao vivo e calcula as odds iniciais
+
+        Reiniciar a mesma partida apenas recalcula as odds; um match_id já em
+        andamento com outros times gera ValueError. Times sem estatísticas geram
+        KeyError sem deixar a partida registrada.
+        """
+        match = self._matches.get(match_id)
+        if match is not None:
+            if (match.home_team, match.away_team) != (home_team, away_team):
+                raise ValueError(
+                    f"Partida {match_id} já em andamento: {match.home_team} x {match.away_team}"
+                )
+            return self._reprice(analyzer, match)
+
+        match = LiveMatch(match_id, home_team, away_team)
+        odds = self._reprice(analyzer, match)
+        self._matches[match_id] = match
+        return odds
+
+    def update_match(self, analyzer: ScoreProbabilityAnalyzer, match_id: str, minute: int,
+                     home_score: int, away_score: int, finished: bool = False) -> Dict:
+        """Aplica o estado atual (minuto e placar) e publica as novas odds"""
+        match = self._matches[match_id]
+        match.minute = minute
+        match.home_score = home_score
+        match.away_score = away_score
+        match.finished = finished
+        odds = self._reprice(analyzer, match)
+        if finished:
+            self._matches.pop(match_id, None)
+        return odds
+
+    def _reprice(self, analyzer: ScoreProbabilityAnalyzer, match: LiveMatch) -> Dict:
+        probabilities = analyzer.calculate_inplay_probabilities(
+            match.home_team, match.away_team, match.minute, match.home_score, match.away_score
+        )
+        if not probabilities:
+            raise KeyError(f"Times sem estatísticas: {match.home_team} x {match.away_team}")
+
+        match.odds = {
+            'match_id': match.match_id,
+            'home_team': match.home_team,
+            'away_team': match.away_team,
+            'finished': match.finished,
+            **probabilities
+        }
+        self._publish(match)
+        return match.odds
+
+    def _publish(self, match: LiveMatch):
+        payload = json.dumps(match.odds, ensure_ascii=False, default=float)
+        for queue in match.subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(payload)
+
+    async def stream(self, match_id: str) -> AsyncIterator[str]:
+        """Gera eventos SSE com as odds da partida a cada atualização"""
+        match = self._matches[match_id]
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        match.subscribers.add(queue)
+        try:
+            yield f"data: {json.dumps(match.odds, ensure_ascii=False, default=float)}\n\n"
+            while not match.finished:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    # Mantém a conexão viva através de proxies
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {payload}\n\n"
+            while not queue.empty():
+                yield f"data: {queue.get_nowait()}\n\n"
+        finally:
+            match.subscribers.discard(queue)
+
+live_hub = LiveMatchHub()
+
+def get_live_hub() -> LiveMatchHub:
+    return live_hub
@@ -0,0 +1,214 @@
+# app/services/player_stats_service.py
+import base64
+import json
+import logging
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import (
+    Column, Date, DateTime, Float, Index, Integer, MetaData, String, Table,
+    and_, case, create_engine, func, or_, select
+)
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Últimas partidas (por match_date) que compõem a forma recente
+FORM_WINDOW = 5
+
+COUNTER_FIELDS = ['minutes', 'goals', 'assists', 'shots', 'yellow_cards', 'red_cards']
+PER_90_FIELDS = ['goals', 'assists', 'shots']
+
+metadata = MetaData()
+
+# Uma linha por jogador/partida: garante que reenviar a mesma partida não duplica as somas
+player_appearances = Table(
+    'player_appearances', metadata,
+    Column('player_id', String, primary_key=True),
+    Column('match_id', String, primary_key=True),
+    Column('season', String, nullable=False),
+    Column('match_date', Date),
+    *[Column(field, Integer, nullable=False, default=0) for field in COUNTER_FIELDS],
+    Column('rating', Float)
+)
+
+# Agregado por jogador/temporada, mantido incrementalmente na ingestão
+player_stats = Table(
+    'player_stats', metadata,
+    Column('season', String, primary_key=True),
+    Column('player_id', String, primary_key=True),
+    Column('player_name', String, nullable=False),
+    Column('team', String, nullable=False),
+    Column('position', String, nullable=False),
+    Column('appearances', Integer, nullable=False, default=0),
+    *[Column(field, Integer, nullable=False, default=0) for field in COUNTER_FIELDS],
+    *[Column(f'{field}_per90', Float, nullable=False, default=0.0) for field in PER_90_FIELDS],
+    Column('form_rating', Float),
+    Column('form_goal_contributions', Float),
+    Column('last_match_date', Date),
+    Column('updated_at', DateTime, nullable=False),
+    Index('ix_player_stats_team', 'team', 'season', 'player_id'),
+    Index('ix_player_stats_team_position', 'team', 'position', 'season', 'player_id'),
+    Index('ix_player_stats_position', 'position', 'season', 'player_id')
+)
+
+def _encode_cursor(season: str, player_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([season, player_id]).encode()).decode()
+
+def _decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        season, player_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Cursor inválido") from e
+    return str(season), str(player_id)
+
+def _insert_ignore(conn, table):
+    """INSERT que ignora linhas já existentes (ON CONFLICT DO NOTHING)"""
+    dialect = postgresql if conn.dialect.name == 'postgresql' else sqlite
+    return dialect.insert(table).on_conflict_do_nothing()
+
+class PlayerStatsStore:
+    """Tabela agregada de estatísticas de jogadores com métricas pré-calculadas
+
+    As somas e métricas por 90 minutos são incrementadas no próprio banco e a
+    forma recente é recalculada das últimas FORM_WINDOW partidas por match_date,
+    de modo que ingestões concorrentes ou fora de ordem não corrompem o agregado
+    e as consultas apenas leem os índices team/position.
+    """
+
+    def __init__(self, database_url: str = settings.DATABASE_URL):
+        self.engine = create_engine(database_url, future=True)
+        metadata.create_all(self.engine)
+
+    def ingest_appearances(self, appearances: Iterable[Dict]) -> int:
+        """Incorpora participações de jogadores em partidas; retorna quantas eram novas
+
+        Cada participação precisa de player_id, player_name, team, position,
+        match_id e season; minutes, goals, assists, shots, yellow_cards,
+        red_cards, rating e match_date são opcionais.
+        """
+        appearances = sorted(appearances, key=lambda a: str(a.get('match_date') or ''))
+        ingested = 0
+
+        with self.engine.begin() as conn:
+            insert_appearance = _insert_ignore(conn, player_appearances)
+            deltas: Dict[Tuple[str, str], Dict] = {}
+            for appearance in appearances:
+                player_id = str(appearance['player_id'])
+                season = str(appearance['season'])
+                match_date = appearance.get('match_date')
+                if isinstance(match_date, str):
+                    match_date = datetime.fromisoformat(match_date).date()
+                counters = {field: int(appearance.get(field) or 0) for field in COUNTER_FIELDS}
+
+                # A chave primária decide o que é novo, inclusive entre ingestões simultâneas
+                result = conn.execute(insert_appearance.values(
+                    player_id=player_id, match_id=str(appearance['match_id']), season=season,
+                    match_date=match_date, rating=appearance.get('rating'), **counters
+                ))
+                if result.rowcount != 1:
+                    continue
+                ingested += 1
+
+                delta = deltas.setdefault((season, player_id), {
+                    'appearances': 0, **{field: 0 for field in COUNTER_FIELDS}
+                })
+                delta['player_name'] = appearance['player_name']
+                delta['team'] = appearance['team']
+                delta['position'] = appearance['position']
+                delta['appearances'] += 1
+                for field in COUNTER_FIELDS:
+                    delta[field] += counters[field]
+
+            now = datetime.utcnow()
+            insert_stats = _insert_ignore(conn, player_stats)
+            for (season, player_id), delta in deltas.items():
+                conn.execute(insert_stats.values(
+                    season=season, player_id=player_id, player_name=delta['player_name'],
+                    team=delta['team'], position=delta['position'], appearances=0,
+                    **{field: 0 for field in COUNTER_FIELDS},
+                    **{f'{field}_per90': 0.0 for field in PER_90_FIELDS},
+                    updated_at=now
+                ))
+                conn.execute(
+                    player_stats.update()
+                    .where(and_(player_stats.c.season == season, player_stats.c.player_id == player_id))
+                    .values(**self._aggregate_update(season, player_id, delta), updated_at=now)
+                )
+
+        logger.info(f"{ingested} participações de jogadores ingeridas")
+        return ingested
+
+    @staticmethod
+    def _aggregate_update(season: str, player_id: str, delta: Dict) -> Dict:
+        """Expressões SQL do UPDATE: somas incrementadas no banco e forma a partir das participações"""
+        values = {
+            'player_name': delta['player_name'],
+            'team': delta['team'],
+            'position': delta['position'],
+            'appearances': player_stats.c.appearances + delta['appearances'],
+            **{field: player_stats.c[field] + delta[field] for field in COUNTER_FIELDS}
+        }
+        minutes = player_stats.c.minutes + delta['minutes']
+        for field in PER_90_FIELDS:
+            values[f'{field}_per90'] = case(
+                (minutes > 0, func.round((player_stats.c[field] + delta[field]) * 90.0 / minutes, 3)), else_=0.0
+            )
+
+        player_matches = and_(
+            player_appearances.c.season == season, player_appearances.c.player_id == player_id
+        )
+        recent = (
+            select(
+                player_appearances.c.rating,
+                (player_appearances.c.goals + player_appearances.c.assists).label('contributions')
+            )
+            .where(player_matches)
+            .order_by(player_appearances.c.match_date.desc().nulls_last(), player_appearances.c.match_id.desc())
+            .limit(FORM_WINDOW)
+            .subquery()
+        )
+        values['form_rating'] = select(func.avg(recent.c.rating)).scalar_subquery()
+        values['form_goal_contributions'] = select(func.avg(recent.c.contributions)).scalar_subquery()
+        values['last_match_date'] = (
+            select(func.max(player_appearances.c.match_date)).where(player_matches).scalar_subquery()
+        )
+        return values
+
+    def list_player_stats(self, team: Optional[str] = None, position: Optional[str] = None,
+                          season: Optional[str] = None, limit: int = 50,
+                          cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Lista jogadores filtrados, paginando por cursor (season, player_id)
+
+        Retorna a página e o cursor da próxima (None na última página).
+        """
+        query = select(player_stats)
+        if team:
+            query = query.where(player_stats.c.team == team)
+        if position:
+            query = query.where(player_stats.c.position == position)
+        if season:
+            query = query.where(player_stats.c.season == season)
+        if cursor:
+            last_season, last_player_id = _decode_cursor(cursor)
+            query = query.where(or_(
+                player_stats.c.season > last_season,
+                and_(player_stats.c.season == last_season, player_stats.c.player_id > last_player_id)
+            ))
+        query = query.order_by(player_stats.c.season, player_stats.c.player_id).limit(limit + 1)
+
+        with self.engine.connect() as conn:
+            rows = [dict(row) for row in conn.execute(query).mappings()]
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1]['season'], rows[-1]['player_id'])
+        return rows, next_cursor
+
+@lru_cache()
+def get_player_stats_store() -> PlayerStatsStore:
+    return PlayerStatsStore()
@@ -0,0 +1,117 @@
+# tests/test_analyzer_snapshot.py
+import json
+import os
+
+import numpy as np
+import pytest
+
+from analysts import analyzer_snapshot
+from analysts.analyzer_snapshot import file_checksum, load_or_build_analyzer, load_snapshot, save_snapshot
+from analysts.score_analyzer import ScoreProbabilityAnalyzer
+
+TEAMS = ['Flamengo', 'Palmeiras', 'São Paulo', 'Grêmio', 'Bahia']
+
+def _matches(seed=9):
+    rng = np.random.default_rng(seed)
+    return {
+        season: [
+            {
+                'home_team': home, 'away_team': away,
+                'home_score': int(rng.poisson(1.5)), 'away_score': int(rng.poisson(1.1))
+            }
+            for home in TEAMS for away in TEAMS if home != away
+        ]
+        for season in ('2023', '2024')
+    }
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / 'matches.json'
+    path.write_text(json.dumps(_matches(), ensure_ascii=False), encoding='utf-8')
+    return str(path)
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    return str(tmp_path / 'analyzer_snapshot.npz')
+
+def _build(data_file):
+    with open(data_file, encoding='utf-8') as f:
+        return ScoreProbabilityAnalyzer(json.load(f))
+
+def test_snapshot_round_trip_matches_fresh_build(data_file, snapshot_path):
+    checksum = file_checksum(data_file)
+    save_snapshot(_build(data_file), snapshot_path, checksum)
+
+    restored = load_snapshot(snapshot_path, checksum)
+    fresh = _build(data_file)
+
+    assert restored is not None
+    assert len(restored.matches_2023) == len(fresh.matches_2023)
+    assert len(restored.all_matches) == len(fresh.all_matches)
+    fixtures = [(home, away) for home in TEAMS for away in TEAMS if home != away]
+    np.testing.assert_allclose(restored.score_probability_tensor(fixtures), fresh.score_probability_tensor(fixtures))
+    for home, away in fixtures:
+        assert restored.calculate_score_probabilities(home, away) == fresh.calculate_score_probabilities(home, away)
+        assert (restored.calculate_inplay_probabilities(home, away, 70, 1, 1)
+                == fresh.calculate_inplay_probabilities(home, away, 70, 1, 1))
+    bootstrap_kwargs = dict(n_resamples=100, batch_size=50, seed=4)
+    assert (restored.bootstrap_score_probabilities('Flamengo', 'Bahia', **bootstrap_kwargs)
+            == fresh.bootstrap_score_probabilities('Flamengo', 'Bahia', **bootstrap_kwargs))
+    assert restored.analyze_common_scores() == fresh.analyze_common_scores()
+    assert [name for name in os.listdir(os.path.dirname(snapshot_path)) if name.endswith('.tmp')] == []
+
+def test_snapshot_team_stats_survive_round_trip(data_file, snapshot_path):
+    checksum = file_checksum(data_file)
+    fresh = _build(data_file)
+    save_snapshot(fresh, snapshot_path, checksum)
+
+    restored = load_snapshot(snapshot_path, checksum)
+
+    assert restored.team_stats.keys() == fresh.team_stats.keys()
+    for team, stats in fresh.team_stats.items():
+        for key, value in stats.items():
+            assert restored.team_stats[team][key] == pytest.approx(value)
+
+def test_snapshot_with_other_checksum_is_ignored(data_file, snapshot_path):
+    save_snapshot(_build(data_file), snapshot_path, file_checksum(data_file))
+
+    assert load_snapshot(snapshot_path, 'outro-checksum') is None
+    assert load_snapshot(snapshot_path) is not None
+
+def test_snapshot_with_other_format_version_is_ignored(data_file, snapshot_path, monkeypatch):
+    checksum = file_checksum(data_file)
+    monkeypatch.setattr(analyzer_snapshot, 'SNAPSHOT_FORMAT_VERSION', analyzer_snapshot.SNAPSHOT_FORMAT_VERSION + 1)
+    save_snapshot(_build(data_file), snapshot_path, checksum)
+    monkeypatch.undo()
+
+    assert load_snapshot(snapshot_path, checksum) is None
+
+def test_incomplete_or_corrupted_snapshot_is_ignored(data_file, snapshot_path):
+    checksum = file_checksum(data_file)
+    save_snapshot(_build(data_file), snapshot_path, checksum)
+    with np.load(snapshot_path) as data:
+        arrays = {name: data[name] for name in data.files if name != 'home_idx'}
+    with open(snapshot_path, 'wb') as f:
+        np.savez(f, **arrays)
+
+    assert load_snapshot(snapshot_path, checksum) is None
+
+    with open(snapshot_path, 'wb') as f:
+        f.write(b'nao e um npz')
+    assert load_snapshot(snapshot_path, checksum) is None
+
+def test_load_or_build_rebuilds_after_data_change(data_file, snapshot_path):
+    first = load_or_build_analyzer(data_file, snapshot_path)
+    assert load_snapshot(snapshot_path, file_checksum(data_file)) is not None
+
+    changed = _matches()
+    changed['2024'].append({'home_team': 'Flamengo', 'away_team': 'Bahia', 'home_score': 6, 'away_score': 0})
+    with open(data_file, 'w', encoding='utf-8') as f:
+        json.dump(changed, f, ensure_ascii=False)
+
+    rebuilt = load_or_build_analyzer(data_file, snapshot_path)
+
+    assert len(rebuilt.all_matches) == len(first.all_matches) + 1
+    assert load_snapshot(snapshot_path, file_checksum(data_file)) is not None
+    assert (rebuilt.calculate_score_probabilities('Flamengo', 'Bahia')
+            != first.calculate_score_probabilities('Flamengo', 'Bahia'))
@@ -0,0 +1,17 @@
+# tests/test_main.py
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+
+@pytest.mark.parametrize('content', [None, '{"2023": [', '{"2023": [{"home_team": "Flamengo"}]}'])
+def test_app_starts_without_usable_data(tmp_path, monkeypatch, content):
+    data_file = tmp_path / 'matches.json'
+    if content is not None:
+        data_file.write_text(content, encoding='utf-8')
+    monkeypatch.setattr(settings, 'MATCHES_DATA_FILE', str(data_file))
+    monkeypatch.setattr(settings, 'ANALYZER_SNAPSHOT_FILE', str(tmp_path / 'analyzer_snapshot.npz'))
+
+    with TestClient(app) as client:
+        assert client.get('/health').json() == {'status': 'healthy'}
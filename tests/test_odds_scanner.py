@@ -0,0 +1,121 @@
+# tests/test_odds_scanner.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysts.odds_scanner import OddsScanner
+from analysts.score_analyzer import ScoreProbabilityAnalyzer
+
+TEAMS = ['Flamengo', 'Palmeiras', 'São Paulo', 'Grêmio']
+
+@pytest.fixture(scope='module')
+def analyzer():
+    rng = np.random.default_rng(21)
+    matches = [
+        {
+            'home_team': home, 'away_team': away,
+            'home_score': int(rng.poisson(1.5)), 'away_score': int(rng.poisson(1.1))
+        }
+        for _ in range(2) for home in TEAMS for away in TEAMS if home != away
+    ]
+    return ScoreProbabilityAnalyzer({'2024': matches})
+
+@pytest.fixture
+def scanner(analyzer):
+    return OddsScanner(analyzer, min_expected_value=5.0)
+
+def _offers(rows):
+    return pd.DataFrame(rows, columns=OddsScanner.REQUIRED_COLUMNS)
+
+def _probability(analyzer, home_team, away_team, home_goals, away_goals):
+    return analyzer.score_probability_tensor([(home_team, away_team)])[0, home_goals, away_goals]
+
+def test_encode_scores_handles_separators_grid_and_missing():
+    scores = pd.Series(['1-0', '1x0', '2-3', '6-0', '0-6', '5-5', 'Outro', None, np.nan, ' 3 - 1 '])
+
+    codes = OddsScanner._encode_scores(scores)
+
+    assert codes.tolist() == [6, 6, 15, -1, -1, 35, -1, -1, -1, 19]
+
+def test_encode_scores_accepts_categoricals():
+    scores = pd.Series(['0-0', '4-2', '7-1', None], dtype='category')
+
+    assert OddsScanner._encode_scores(scores).tolist() == [0, 26, -1, -1]
+
+def test_scan_keeps_best_price_per_fixture_and_score(analyzer, scanner):
+    fair = 1 / _probability(analyzer, 'Flamengo', 'Palmeiras', 1, 0)
+    offers = _offers([
+        ['bk1', 'Flamengo', 'Palmeiras', '1-0', round(fair * 1.2, 2)],
+        ['bk2', 'Flamengo', 'Palmeiras', '1-0', round(fair * 1.5, 2)],
+        ['bk3', 'Flamengo', 'Palmeiras', '1x0', round(fair * 1.3, 2)],
+        ['bk4', 'Flamengo', 'Palmeiras', '1-0', round(fair * 0.9, 2)]
+    ])
+
+    best = scanner.scan(offers)
+    every_price = scanner.scan(offers, best_price_only=False)
+
+    assert best[['casa', 'placar']].values.tolist() == [['bk2', '1-0']]
+    assert sorted(every_price['casa']) == ['bk1', 'bk2', 'bk3']
+
+def test_scan_excludes_unknown_teams_and_off_grid_scores(analyzer, scanner):
+    offers = _offers([
+        ['bk1', 'Flamengo', 'Desconhecido', '1-0', 500.0],
+        ['bk1', 'Desconhecido', 'Grêmio', '0-0', 500.0],
+        ['bk1', 'Flamengo', 'Grêmio', '6-0', 5000.0],
+        ['bk1', 'Flamengo', 'Grêmio', None, 500.0],
+        ['bk1', 'São Paulo', 'Grêmio', '0-0', 500.0]
+    ])
+
+    result = scanner.scan(offers)
+
+    assert result['jogo'].tolist() == ['São Paulo vs Grêmio']
+
+def test_scan_expected_value_and_kelly(analyzer, scanner):
+    odds = 12.0
+    probability = _probability(analyzer, 'Grêmio', 'Flamengo', 2, 1)
+    offers = _offers([['bk1', 'Grêmio', 'Flamengo', '2-1', odds]])
+    scanner.min_expected_value = -100
+
+    row = scanner.scan(offers).iloc[0]
+
+    expected_value = probability * odds - 1
+    assert row['probabilidade_real'] == pytest.approx(probability * 100, abs=1e-3)
+    assert row['fair_odds'] == pytest.approx(1 / probability, abs=0.01)
+    assert row['value_esperado'] == pytest.approx(expected_value * 100, abs=0.05)
+    assert row['kelly'] == pytest.approx(expected_value / (odds - 1), abs=1e-4)
+
+def test_scan_filters_by_min_expected_value_and_sorts(analyzer, scanner):
+    rows = []
+    for score, factor in [('0-0', 1.04), ('1-1', 1.30), ('2-0', 1.10)]:
+        home_goals, away_goals = map(int, score.split('-'))
+        rows.append(['bk1', 'Palmeiras', 'São Paulo', score,
+                     factor / _probability(analyzer, 'Palmeiras', 'São Paulo', home_goals, away_goals)])
+
+    result = scanner.scan(_offers(rows))
+
+    assert result['placar'].tolist() == ['1-1', '2-0']
+    assert result['value_esperado'].tolist() == pytest.approx([30.0, 10.0], abs=0.1)
+
+def test_load_snapshot_formats_match(analyzer, scanner, tmp_path):
+    offers = _offers([
+        ['bk1', 'Flamengo', 'Palmeiras', '1-0', 9.5],
+        ['bk2', 'Grêmio', 'São Paulo', '2-2', 21.0],
+        ['bk1', 'Palmeiras', 'Flamengo', '0-1', 15.0]
+    ])
+    offers.to_csv(tmp_path / 'odds.csv', index=False)
+    offers.to_json(tmp_path / 'odds.ndjson', orient='records', lines=True, force_ascii=False)
+
+    from_csv = scanner.load_snapshot(str(tmp_path / 'odds.csv'))
+    from_ndjson = scanner.load_snapshot(str(tmp_path / 'odds.ndjson'))
+
+    for column in OddsScanner.KEY_COLUMNS:
+        assert isinstance(from_ndjson[column].dtype, pd.CategoricalDtype)
+    scanner.min_expected_value = -100
+    pd.testing.assert_frame_equal(scanner.scan(from_csv), scanner.scan(from_ndjson))
+
+def test_load_snapshot_rejects_missing_columns(scanner, tmp_path):
+    path = tmp_path / 'odds.ndjson'
+    path.write_text('{"bookmaker": "bk1", "home_team": "Flamengo", "score": "1-0", "odds": 7.0}\n')
+
+    with pytest.raises(ValueError, match='away_team'):
+        scanner.load_snapshot(str(path))
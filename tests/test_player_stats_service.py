@@ -0,0 +1,85 @@
+# tests/test_player_stats_service.py
+import pytest
+
+from app.services.player_stats_service import FORM_WINDOW, PlayerStatsStore
+
+@pytest.fixture
+def store(tmp_path):
+    return PlayerStatsStore(f"sqlite:///{tmp_path / 'player_stats.db'}")
+
+def _appearance(player_id, match_id, match_date, season='2024', team='Flamengo', position='FW',
+                goals=0, assists=0, rating=7.0, minutes=90):
+    return {
+        'player_id': player_id, 'player_name': f'Jogador {player_id}', 'team': team,
+        'position': position, 'match_id': match_id, 'season': season, 'match_date': match_date,
+        'minutes': minutes, 'goals': goals, 'assists': assists, 'rating': rating
+    }
+
+def _get(store, player_id, season='2024'):
+    rows, _ = store.list_player_stats(season=season, limit=500)
+    return next(row for row in rows if row['player_id'] == player_id)
+
+def test_keyset_pagination_covers_all_rows_once(store):
+    appearances = [
+        _appearance(f'p{i:02d}', 'm1', f'{season}-05-01', season=season,
+                    team='Flamengo' if i % 2 else 'Palmeiras', position='FW' if i % 3 else 'DF')
+        for season in ('2023', '2024') for i in range(13)
+    ]
+    store.ingest_appearances(appearances)
+
+    for filters in ({}, {'team': 'Flamengo'}, {'team': 'Palmeiras', 'position': 'FW'}, {'season': '2024'}):
+        expected, _ = store.list_player_stats(limit=500, **filters)
+        seen, cursor = [], None
+        while True:
+            page, cursor = store.list_player_stats(limit=4, cursor=cursor, **filters)
+            assert len(page) <= 4
+            seen.extend((row['season'], row['player_id']) for row in page)
+            if cursor is None:
+                break
+        assert seen == [(row['season'], row['player_id']) for row in expected]
+        assert len(seen) == len(set(seen))
+
+def test_invalid_cursor_raises_value_error(store):
+    with pytest.raises(ValueError):
+        store.list_player_stats(cursor='não-é-cursor')
+
+def test_reingest_is_idempotent(store):
+    appearances = [
+        _appearance('p1', f'm{i}', f'2024-05-{i + 1:02d}', goals=i % 2, minutes=60 + i)
+        for i in range(4)
+    ]
+    assert store.ingest_appearances(appearances) == 4
+    before = _get(store, 'p1')
+
+    assert store.ingest_appearances(appearances) == 0
+    assert store.ingest_appearances(appearances[:2]) == 0
+    after = _get(store, 'p1')
+
+    for field in ('appearances', 'minutes', 'goals', 'goals_per90', 'form_rating', 'last_match_date'):
+        assert after[field] == before[field]
+    assert after['appearances'] == 4
+    assert after['goals'] == 2
+    assert after['goals_per90'] == pytest.approx(round(2 * 90 / 246, 3))
+
+def test_form_uses_latest_matches_regardless_of_ingest_order(store):
+    recent = [
+        _appearance('p1', f'm{i}', f'2024-06-{i + 1:02d}', goals=1, rating=8.0)
+        for i in range(FORM_WINDOW)
+    ]
+    store.ingest_appearances(recent)
+    before = _get(store, 'p1')
+
+    # Partida antiga enviada depois (backfill) não altera a forma recente
+    store.ingest_appearances([_appearance('p1', 'old', '2024-01-10', goals=0, assists=0, rating=3.0)])
+    after = _get(store, 'p1')
+
+    assert after['appearances'] == FORM_WINDOW + 1
+    assert after['form_rating'] == before['form_rating'] == pytest.approx(8.0)
+    assert after['form_goal_contributions'] == pytest.approx(1.0)
+    assert str(after['last_match_date']) == f'2024-06-{FORM_WINDOW:02d}'
+
+    # Uma partida nova entra na janela e empurra a mais antiga para fora
+    store.ingest_appearances([_appearance('p1', 'new', '2024-07-01', goals=0, rating=3.0)])
+    latest = _get(store, 'p1')
+    assert latest['form_rating'] == pytest.approx((8.0 * (FORM_WINDOW - 1) + 3.0) / FORM_WINDOW)
+    assert str(latest['last_match_date']) == '2024-07-01'
@@ -0,0 +1,177 @@
+# tests/test_score_analyzer.py
+import numpy as np
+import pytest
+
+from analysts.score_analyzer import (
+    INPLAY_MAX_EXTRA_GOALS, _EXTRA_AWAY, _EXTRA_HOME, ScoreProbabilityAnalyzer
+)
+
+TEAMS = ['Flamengo', 'Palmeiras', 'São Paulo', 'Grêmio', 'Bahia', 'Fortaleza']
+
+@pytest.fixture(scope='module')
+def analyzer():
+    rng = np.random.default_rng(7)
+    matches = {}
+    for season in ('2023', '2024'):
+        matches[season] = [
+            {
+                'home_team': home, 'away_team': away,
+                'home_score': int(rng.poisson(1.5)), 'away_score': int(rng.poisson(1.1))
+            }
+            for home in TEAMS for away in TEAMS if home != away
+        ]
+    return ScoreProbabilityAnalyzer(matches)
+
+def _brute_force_grid(analyzer, home_team, away_team, minute):
+    expected_home, expected_away = analyzer._expected_goals(home_team, away_team)
+    return np.outer(
+        analyzer._remaining_goals_pmf(expected_home, minute),
+        analyzer._remaining_goals_pmf(expected_away, minute)
+    )
+
+@pytest.mark.parametrize('minute,home_score,away_score', [
+    (0, 0, 0), (30, 1, 0), (55, 0, 2), (75, 2, 2), (89, 3, 1), (90, 1, 1)
+])
+def test_inplay_markets_match_brute_force_grid(analyzer, minute, home_score, away_score):
+    grid = _brute_force_grid(analyzer, 'Flamengo', 'Palmeiras', minute)
+    final_home = home_score + _EXTRA_HOME
+    final_away = away_score + _EXTRA_AWAY
+    expected = {
+        'home_win': grid[final_home > final_away].sum(),
+        'draw': grid[final_home == final_away].sum(),
+        'away_win': grid[final_home < final_away].sum(),
+        'over_2_5': grid[final_home + final_away > 2].sum(),
+        'under_2_5': grid[final_home + final_away <= 2].sum(),
+        'btts': grid[(final_home > 0) & (final_away > 0)].sum()
+    }
+
+    result = analyzer.calculate_inplay_probabilities('Flamengo', 'Palmeiras', minute, home_score, away_score)
+
+    assert result['current_score'] == f"{home_score}-{away_score}"
+    for market, probability in expected.items():
+        assert result['markets'][market]['probability'] == pytest.approx(probability * 100, abs=1e-3)
+
+def test_inplay_final_scores_match_brute_force_grid(analyzer):
+    minute, home_score, away_score = 60, 1, 0
+    grid = _brute_force_grid(analyzer, 'Palmeiras', 'Bahia', minute)
+
+    result = analyzer.calculate_inplay_probabilities('Palmeiras', 'Bahia', minute, home_score, away_score, top_n=5)
+
+    assert len(result['final_scores']) == 5
+    top_cells = np.argsort(grid.ravel())[::-1][:5]
+    for cell, (score, data) in zip(top_cells, result['final_scores'].items()):
+        extra_home, extra_away = np.unravel_index(cell, grid.shape)
+        assert score == f"{home_score + extra_home}-{away_score + extra_away}"
+        assert data['probability'] == pytest.approx(grid.ravel()[cell] * 100, abs=1e-3)
+
+def test_inplay_full_time_is_certain(analyzer):
+    result = analyzer.calculate_inplay_probabilities('Grêmio', 'Bahia', 90, 2, 1)
+
+    assert result['final_scores'] == {'2-1': {'probability': 100.0, 'fair_odds': 1.0}}
+    assert result['markets']['home_win']['probability'] == 100.0
+    assert result['markets']['over_2_5']['probability'] == 100.0
+
+def test_inplay_grid_covers_remaining_goals(analyzer):
+    grid = _brute_force_grid(analyzer, 'Flamengo', 'Palmeiras', 0)
+
+    assert grid.shape == (INPLAY_MAX_EXTRA_GOALS + 1, INPLAY_MAX_EXTRA_GOALS + 1)
+    assert grid.sum() == pytest.approx(1.0)
+
+def test_inplay_unknown_team_returns_empty(analyzer):
+    assert analyzer.calculate_inplay_probabilities('Flamengo', 'Desconhecido', 10, 0, 0) == {}
+
+class _IdentityRng:
+    """Reamostragem que devolve sempre o histórico original, na ordem"""
+
+    def __init__(self, seed=None):
+        pass
+
+    def integers(self, low, high, size):
+        return np.tile(np.arange(low, high), (size[0], 1))
+
+def test_bootstrap_is_reproducible_with_seed(analyzer):
+    first = analyzer.bootstrap_score_probabilities('Flamengo', 'Palmeiras', n_resamples=300, batch_size=100, seed=11)
+    second = analyzer.bootstrap_score_probabilities('Flamengo', 'Palmeiras', n_resamples=300, batch_size=100, seed=11)
+    other = analyzer.bootstrap_score_probabilities('Flamengo', 'Palmeiras', n_resamples=300, batch_size=100, seed=12)
+
+    assert first == second
+    assert first != other
+
+def test_bootstrap_parallel_matches_serial(analyzer):
+    kwargs = dict(n_resamples=300, batch_size=100, seed=5)
+    serial = analyzer.bootstrap_score_probabilities('Grêmio', 'Fortaleza', **kwargs)
+    parallel = analyzer.bootstrap_score_probabilities('Grêmio', 'Fortaleza', n_jobs=2, **kwargs)
+
+    assert parallel == serial
+
+def test_bootstrap_identity_resample_equals_point_estimate(analyzer, monkeypatch):
+    monkeypatch.setattr(np.random, 'default_rng', _IdentityRng)
+
+    intervals = analyzer.bootstrap_score_probabilities('São Paulo', 'Bahia', n_resamples=20, batch_size=10)
+    point_estimates = analyzer.calculate_score_probabilities('São Paulo', 'Bahia')
+
+    assert intervals.keys() == point_estimates.keys()
+    for score, interval in intervals.items():
+        assert interval['std'] == 0
+        assert interval['lower'] == interval['upper']
+        assert interval['lower'] == pytest.approx(point_estimates[score]['probability'], abs=2e-3)
+
+def test_value_bets_require_odds_above_fair(analyzer):
+    probabilities = analyzer.calculate_score_probabilities('Flamengo', 'Palmeiras')
+    short_odds = {score: data['fair_odds'] * 0.8 for score, data in probabilities.items()}
+    long_odds = {score: data['fair_odds'] * 1.2 for score, data in probabilities.items()}
+
+    assert analyzer.find_value_bets('Flamengo', 'Palmeiras', short_odds) == []
+    value_bets = analyzer.find_value_bets('Flamengo', 'Palmeiras', long_odds)
+    assert value_bets
+    for bet in value_bets:
+        assert bet['expected_value'] == pytest.approx((bet['probability'] / 100 * bet['available_odds'] - 1) * 100, abs=0.1)
+
+@pytest.fixture(scope='module')
+def thin_analyzer():
+    """Liga em que um time tem só dois jogos: intervalo bootstrap largo"""
+    rng = np.random.default_rng(3)
+    matches = [
+        {
+            'home_team': home, 'away_team': away,
+            'home_score': int(rng.poisson(1.4)), 'away_score': int(rng.poisson(1.1))
+        }
+        for home in TEAMS for away in TEAMS if home != away
+    ]
+    matches += [
+        {'home_team': 'Novato', 'away_team': 'Flamengo', 'home_score': 3, 'away_score': 0},
+        {'home_team': 'Palmeiras', 'away_team': 'Novato', 'home_score': 1, 'away_score': 2}
+    ]
+    return ScoreProbabilityAnalyzer({'2024': matches})
+
+def test_conservative_value_bets_ignore_wide_intervals(thin_analyzer):
+    bootstrap_kwargs = dict(n_resamples=400, batch_size=200, seed=1)
+    intervals = thin_analyzer.bootstrap_score_probabilities('Novato', 'Flamengo', **bootstrap_kwargs)
+    score = max(intervals, key=lambda s: intervals[s]['probability'])
+    interval = intervals[score]
+    # Odd com EV de 10% pela estimativa pontual, mas negativo no limite inferior
+    odds = {score: round(1.10 / (interval['probability'] / 100), 2)}
+    assert (interval['lower'] / 100 * odds[score] - 1) * 100 < 5
+
+    assert [bet['score'] for bet in thin_analyzer.find_value_bets('Novato', 'Flamengo', odds)] == [score]
+    assert thin_analyzer.find_value_bets(
+        'Novato', 'Flamengo', odds, use_confidence_intervals=True, **bootstrap_kwargs
+    ) == []
+
+def test_conservative_value_bets_flag_odds_above_lower_bound(thin_analyzer):
+    bootstrap_kwargs = dict(n_resamples=400, batch_size=200, seed=1)
+    intervals = thin_analyzer.bootstrap_score_probabilities('Novato', 'Flamengo', **bootstrap_kwargs)
+    score = max(intervals, key=lambda s: intervals[s]['probability'])
+    odds = {score: round(1.20 / (intervals[score]['lower'] / 100), 2)}
+
+    value_bets = thin_analyzer.find_value_bets(
+        'Novato', 'Flamengo', odds, use_confidence_intervals=True, **bootstrap_kwargs
+    )
+
+    assert [bet['score'] for bet in value_bets] == [score]
+    assert value_bets[0]['expected_value_lower'] == pytest.approx(20.0, abs=0.5)
+
+@pytest.mark.parametrize('kwargs', [{'n_resamples': 0}, {'n_resamples': -5}, {'batch_size': 0}, {'confidence': 1.0}])
+def test_bootstrap_rejects_invalid_arguments(analyzer, kwargs):
+    with pytest.raises(ValueError):
+        analyzer.bootstrap_score_probabilities('Flamengo', 'Palmeiras', **kwargs)